@@ -1,10 +1,26 @@
+import { readFile } from 'fs/promises';
+import path from 'path';
 import Link from 'next/link';
-import ClinicCard from '@/components/ClinicCard';
-import allClinicsData from '@/data/all_clinics.json';
-import FilterLogic from './clinics/FilterLogic.client';
+import ClinicSearch from '@/components/ClinicSearch.client';
 
 export const revalidate = 3600; // rebuild every hour
 
+const INDEX_DIR = path.join(process.cwd(), 'public', 'data', 'search');
+const FIRST_PAGE_SIZE = 20;
+
+// Only the first page of the index (python cli.py index data/all_clinics.json)
+// is rendered on the server; the client fetches the rest on demand
+async function loadFirstPage() {
+  try {
+    const manifest = JSON.parse(await readFile(path.join(INDEX_DIR, 'manifest.json'), 'utf-8'));
+    const chunk = JSON.parse(await readFile(path.join(INDEX_DIR, 'records', '0.json'), 'utf-8'));
+    return { total: manifest.record_count, records: chunk.slice(0, FIRST_PAGE_SIZE) };
+  } catch (e) {
+    console.error(`Search index not found in ${INDEX_DIR}`, e);
+    return { total: 0, records: [] };
+  }
+}
+
 
 export default async function HagwonsPage({ searchParams }) {
   const sp = await searchParams;
@@ -19,8 +35,8 @@ export default async function HagwonsPage({ searchParams }) {
     format: Array.isArray(sp.format) ? sp.format : sp.format ? [sp.format] : [],
     service: Array.isArray(sp.service) ? sp.service : sp.service ? [sp.service] : [],
   };
-  console.log(selected)
-  
+  const firstPage = await loadFirstPage();
+
   return (
     <main className="min-h-screen max-w-4xl mx-[5dvw] lg:mx-auto mb-[10em]">
       <h1>Compare Top Plastic Surgery Clinics in Korea</h1>
@@ -32,23 +48,7 @@ export default async function HagwonsPage({ searchParams }) {
 
       {/* <FilterLinks selected={selected} /> */}
 
-      <div className="space-y-5 flex flex-col mt-6" id="hagwon-list">
-        {allClinicsData.map((card, i) => (
-          <div
-            key={`${card.id ?? 'hagwon'}-${i}`}
-            data-hagwon
-            data-region={card.region}
-            data-lessontype={card.lessonType}
-            data-format={card.format}
-            data-service={card.ia_ee_tok ? 'IA,EE,TOK' : ''}
-          >
-            <ClinicCard {...card} priority={i === 0} />
-          </div>
-        ))}
-      </div>
-
-      {/* Hydrate client-side filtering logic */}
-      <FilterLogic />
+      <ClinicSearch initialRecords={firstPage.records} initialTotal={firstPage.total} />
     </main>
   );
 }
@@ -0,0 +1,217 @@
+import queue
+import threading
+import time
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_PAGE_TIMEOUT = 20
+# Browsers leak memory over many pages; replace each after this many renders
+MAX_RENDERS_PER_BROWSER = 50
+# How long to wait for client-side rendering to stop changing the page
+SETTLE_TIMEOUT = 5
+SETTLE_INTERVAL = 0.5
+# After Chrome fails to start, wait this long before trying to start one again
+START_RETRY_SECONDS = 300
+
+# Resources a rendered DOM never needs
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mov', '*.mp3', '*.m4a', '*.avi',
+]
+
+# Root nodes of client-rendered apps (React, Vue, Angular, Nuxt, Next)
+FRAMEWORK_ROOT_SELECTORS = [
+    '#root', '#app', '#__next', '#__nuxt', '[ng-app]', '[data-reactroot]', 'app-root', '[id^="app-"]',
+]
+NON_TEXT_TAGS = {'script', 'style', 'noscript', 'template'}
+# A clinic page with less visible text than this is an unrendered shell
+MIN_RENDERED_TEXT_LENGTH = 200
+
+
+def visible_text_length(soup):
+    """Characters of text a visitor would see, ignoring script/style contents"""
+    body = soup.body or soup
+    return sum(
+        len(string.strip()) for string in body.find_all(string=True)
+        if string.parent is not None and string.parent.name not in NON_TEXT_TAGS
+    )
+
+
+def looks_unrendered(soup):
+    """True for pages whose content is built client-side: little text plus an app root or scripts"""
+    if visible_text_length(soup) >= MIN_RENDERED_TEXT_LENGTH:
+        return False
+    if any(soup.select_one(selector) for selector in FRAMEWORK_ROOT_SELECTORS):
+        return True
+    return bool(soup.find('script', src=True))
+
+
+def create_chrome_driver(block_resources=False, page_timeout=DEFAULT_PAGE_TIMEOUT):
+    """Start a headless Chrome configured to look like a regular browser
+
+    block_resources skips images, fonts and media, which rendering for
+    extraction never needs.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Run in background
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    if block_resources:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+
+    service = Service(ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    if block_resources:
+        # Fonts and media have no preference switch; block them at the network layer
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    driver.set_page_load_timeout(page_timeout)
+    return driver
+
+
+class BrowserPool:
+    """A few reusable headless Chrome instances for pages that need JavaScript
+
+    Browsers start on first use and are shared by all scraper threads; a
+    thread waits when every browser is busy. If selenium or Chrome is not
+    available the pool disables itself and render() returns None; if a
+    browser fails to start, no new one is started for START_RETRY_SECONDS.
+    close() quits every browser, including ones still rendering.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, page_timeout=DEFAULT_PAGE_TIMEOUT):
+        self.size = size
+        self.page_timeout = page_timeout
+        self.idle = queue.Queue()
+        self.started = 0
+        self.renders = {}
+        self.drivers = {}  # Every running browser, idle or checked out
+        self.closed = False
+        self.available = True
+        self.retry_at = 0.0
+        self.lock = threading.Lock()
+
+    def checkout(self):
+        """Take an idle browser, starting one if the pool is not full yet"""
+        while True:
+            if self.closed:
+                raise RuntimeError("browser pool is closed")
+            if not self.available:
+                raise RuntimeError("headless Chrome is not available")
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                start_new = self.started < self.size and time.time() >= self.retry_at
+                if start_new:
+                    self.started += 1
+                elif self.started == 0:
+                    raise RuntimeError("headless Chrome failed to start recently")
+            if start_new:
+                break
+            # Wake up now and then: a broken browser frees a slot instead of an idle browser
+            try:
+                return self.idle.get(timeout=1)
+            except queue.Empty:
+                continue
+        try:
+            driver = create_chrome_driver(block_resources=True, page_timeout=self.page_timeout)
+        except Exception as e:
+            with self.lock:
+                self.started -= 1
+                if isinstance(e, ImportError):
+                    self.available = False
+                else:
+                    self.retry_at = time.time() + START_RETRY_SECONDS
+            raise
+        with self.lock:
+            if not self.closed:
+                self.renders[id(driver)] = 0
+                self.drivers[id(driver)] = driver
+                return driver
+        # close() ran while this browser was starting
+        self.quit(driver)
+        raise RuntimeError("browser pool is closed")
+
+    def checkin(self, driver, healthy=True):
+        """Return a browser to the pool, replacing it if it is broken or worn out"""
+        with self.lock:
+            self.renders[id(driver)] = self.renders.get(id(driver), 0) + 1
+            if not self.closed and healthy and self.renders[id(driver)] < MAX_RENDERS_PER_BROWSER:
+                self.idle.put(driver)
+                return
+            self.renders.pop(id(driver), None)
+            tracked = self.drivers.pop(id(driver), None) is not None
+            if tracked:
+                self.started -= 1
+        # After close() the browser is already gone
+        if tracked:
+            self.quit(driver)
+
+    def quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def render(self, url):
+        """Load url in a browser and return the rendered HTML, or None on failure"""
+        if self.closed or not self.available or (self.started == 0 and time.time() < self.retry_at):
+            return None
+        try:
+            driver = self.checkout()
+        except Exception as e:
+            print(f"  Could not start headless Chrome: {str(e)}")
+            return None
+
+        healthy = True
+        try:
+            driver.get(url)
+            self.wait_until_settled(driver)
+            return driver.page_source
+        except Exception as e:
+            print(f"  Rendering failed for {url}: {str(e)}")
+            healthy = False
+            return None
+        finally:
+            self.checkin(driver, healthy)
+
+    def wait_until_settled(self, driver):
+        """Wait until client-side rendering stops growing the page text"""
+        deadline = time.time() + SETTLE_TIMEOUT
+        last_length = -1
+        while time.time() < deadline:
+            length = driver.execute_script(
+                "return document.readyState === 'complete' && document.body ? document.body.innerText.length : -1"
+            )
+            if length >= MIN_RENDERED_TEXT_LENGTH and length == last_length:
+                return
+            last_length = length
+            time.sleep(SETTLE_INTERVAL)
+
+    def close(self):
+        """Quit every browser, idle or checked out; later renders return None"""
+        with self.lock:
+            self.closed = True
+            drivers = list(self.drivers.values())
+            self.drivers.clear()
+            self.renders.clear()
+            self.started = 0
+        while not self.idle.empty():
+            self.idle.get()
+        # A render still using one of these fails and its checkin() just drops it
+        for driver in drivers:
+            self.quit(driver)
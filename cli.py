@@ -0,0 +1,331 @@
+"""Command line for the clinic data pipeline
+
+    python cli.py discover --query 'site:modoo.at 미금 병원' --output titles.txt
+    python cli.py scrape --urls test_urls.txt --previous data/all_clinics.json --output data/all_clinics.json
+    python cli.py reextract data/all_clinics.json
+    python cli.py export data/all_clinics.json clinics.csv
+    python cli.py normalize data/all_clinics.json
+    python cli.py geocode data/all_clinics.json
+    python cli.py dedupe data/all_clinics.json
+    python cli.py index data/all_clinics.json
+    python cli.py queue enqueue --urls test_urls.txt
+    python cli.py daemon --urls test_urls.txt --previous data/all_clinics.json --output data/all_clinics.json
+
+Every subsystem is imported inside the command that needs it, so quick
+commands never load requests, BeautifulSoup or selenium. Defaults come from
+the standard-library-only modules that define them.
+"""
+import argparse
+import sys
+
+from browser_pool import DEFAULT_POOL_SIZE as DEFAULT_BROWSERS
+from concurrency import DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_PER_HOST
+from crawl_queue import DEFAULT_HOST_DELAY as DEFAULT_QUEUE_HOST_DELAY, DEFAULT_QUEUE_PATH
+from geocoding import DEFAULT_CACHE_PATH
+from refresh_scheduler import DEFAULT_FETCHES_PER_HOUR, DEFAULT_HISTORY_PATH, DEFAULT_TICK_SECONDS
+from regex_guard import DEFAULT_PAGE_SECONDS, DEFAULT_STRATEGY_SECONDS
+from search_index import DEFAULT_INDEX_DIR
+from transport_defaults import (DEFAULT_CONNECT_TIMEOUT, DEFAULT_HOST_DELAY, DEFAULT_MAX_BYTES,
+                                DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE, DEFAULT_READ_TIMEOUT)
+
+
+def add_transport_arguments(parser):
+    """Options shared by every command that fetches clinic pages"""
+    parser.add_argument('--connect-timeout', type=float, default=DEFAULT_CONNECT_TIMEOUT, help='Seconds to wait for a connection')
+    parser.add_argument('--read-timeout', type=float, default=DEFAULT_READ_TIMEOUT, help='Seconds to wait for data')
+    parser.add_argument('--retries', type=int, default=DEFAULT_MAX_RETRIES, help='Retries on 5xx and connection errors')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE, help='Connections kept per host')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES, help='Per-page download cap')
+    parser.add_argument('--http2', action='store_true', help='Use HTTP/2 (needs httpx[http2])')
+    parser.add_argument('--ignore-robots', action='store_true', help='Skip robots.txt and sitemap planning')
+    parser.add_argument('--delay', type=float, default=DEFAULT_HOST_DELAY, help='Minimum seconds between requests to one host')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY, help='Upper bound for parallel requests')
+    parser.add_argument('--max-per-host', type=int, default=DEFAULT_MAX_PER_HOST,
+                        help='Upper bound for parallel requests to one host')
+    parser.add_argument('--render-js', action='store_true',
+                        help='Render client-side pages in headless Chrome (needs selenium)')
+    parser.add_argument('--browsers', type=int, default=DEFAULT_BROWSERS, help='Headless Chrome instances for --render-js')
+    parser.add_argument('--page-budget', type=float, default=DEFAULT_PAGE_SECONDS, help='Seconds of address extraction per page')
+    parser.add_argument('--strategy-budget', type=float, default=DEFAULT_STRATEGY_SECONDS,
+                        help='Seconds per address extraction strategy')
+
+
+def build_scraper(args, previous_records=None):
+    from clinic_scraper import ClinicScraper
+    return ClinicScraper(
+        previous_records=previous_records,
+        pool_size=args.pool_size,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        max_retries=args.retries,
+        http2=args.http2,
+        max_bytes=args.max_bytes,
+        respect_robots=not args.ignore_robots,
+        max_concurrency=args.max_concurrency,
+        max_per_host=args.max_per_host,
+        host_delay=args.delay,
+        page_budget=args.page_budget,
+        strategy_budget=args.strategy_budget,
+        render_js=args.render_js,
+        browsers=args.browsers,
+    )
+
+
+def command_discover(args):
+    """Find clinic titles from search results and clinic URLs from directory pages"""
+    from clinic_io import read_url_file
+
+    queries = list(args.query)
+    if args.queries:
+        queries.extend(read_url_file(args.queries))
+    if queries:
+        import modoo_scraper
+        search = {
+            'selenium': modoo_scraper.get_search_results_selenium,
+            'direct': modoo_scraper.get_search_results_direct_urls,
+            'requests': modoo_scraper.get_search_results_requests,
+        }[args.method]
+        titles = []
+        for query in queries:
+            print(f"Searching: {query}")
+            titles.extend(title for title in search(query, max_results=args.max_results) if title not in titles)
+        modoo_scraper.save_titles(titles, args.output)
+
+    directories = list(args.directory)
+    if args.directories:
+        directories.extend(read_url_file(args.directories))
+    if directories:
+        scraper = build_scraper(args)
+        urls = []
+        try:
+            for directory_url in directories:
+                urls.extend(url for url in scraper.scrape_directory_page(directory_url) if url not in urls)
+        finally:
+            scraper.close()
+        with open(args.urls_output, 'w', encoding='utf-8') as urlfile:
+            urlfile.writelines(url + '\n' for url in urls)
+        print(f"Saved {len(urls)} clinic URLs to {args.urls_output}")
+
+
+def command_scrape(args):
+    """Scrape clinic URLs, reusing unchanged pages from a previous run"""
+    from clinic_io import read_url_file
+
+    urls = list(args.url)
+    if args.urls:
+        urls.extend(read_url_file(args.urls))
+    if not urls:
+        print("No URLs given (use --urls FILE or positional URLs)")
+        return 1
+
+    scraper = build_scraper(args)
+    try:
+        if args.previous:
+            scraper.load_previous_records(args.previous)
+        scraper.scrape_multiple_clinics(urls)
+        scraper.save_to_json(args.output)
+        if args.csv:
+            scraper.save_to_csv(args.csv)
+        if args.columnar:
+            scraper.save_to_columnar(args.columnar)
+    finally:
+        scraper.close()
+
+
+def command_reextract(args):
+    """Re-scrape every URL in a dataset with full extraction, e.g. after extractor changes"""
+    from clinic_io import load_clinics, save_clinics_json
+
+    records = load_clinics(args.input)
+    # No previous records: fingerprint reuse would skip exactly the work we want redone
+    scraper = build_scraper(args)
+    try:
+        scraper.scrape_multiple_clinics([record['url'] for record in records])
+    finally:
+        scraper.close()
+
+    # Keep the old record wherever the page could not be fetched this time
+    fresh = {clinic.url: clinic.to_dict() for clinic in scraper.clinics}
+    merged = [fresh.get(record['url'], record) for record in records]
+    save_clinics_json(merged, args.output or args.input)
+
+
+def command_export(args):
+    """Convert a clinics JSON file to CSV"""
+    from clinic_io import load_clinics, save_clinics_csv
+    save_clinics_csv(load_clinics(args.input), args.output)
+
+
+def command_normalize(args):
+    """Re-normalize phone and address formats across a dataset"""
+    from clinic_normalizer import normalize_file
+    normalize_file(args.input, args.output)
+
+
+def command_geocode(args):
+    """Add coordinates to every clinic, using the local cache first"""
+    from geocoding import geocode_file
+    geocode_file(args.input, args.output, cache_path=args.cache)
+
+
+def command_dedupe(args):
+    """Merge records that describe the same clinic"""
+    from clinic_io import load_clinics, save_clinics_json
+    from entity_resolution import resolve_entities
+    save_clinics_json(resolve_entities(load_clinics(args.input)), args.output or args.input)
+
+
+def command_index(args):
+    """Build the sharded search/facet index the site loads"""
+    from clinic_io import load_clinics
+    from search_index import write_index
+    write_index(load_clinics(args.input), args.output_dir)
+
+
+def command_queue(args):
+    """Coordinator/worker commands for the shared crawl queue"""
+    from crawl_queue import CrawlQueue, run_worker
+    queue = CrawlQueue(args.queue, host_delay=args.host_delay)
+    try:
+        if args.queue_command == 'enqueue':
+            from clinic_io import read_url_file
+            urls = read_url_file(args.urls) if args.urls else []
+            if args.directory:
+                scraper = build_scraper(args)
+                try:
+                    for directory_url in args.directory:
+                        urls.extend(scraper.scrape_directory_page(directory_url))
+                finally:
+                    scraper.close()
+            if args.requeue:
+                queue.requeue_all()
+            queue.enqueue(urls)
+        elif args.queue_command == 'work':
+            scraper = build_scraper(args)
+            try:
+                run_worker(queue, scraper, args.worker_id)
+            finally:
+                scraper.close()
+        elif args.queue_command == 'export':
+            queue.export(args.output)
+        elif args.queue_command == 'status':
+            print(queue.counts())
+    finally:
+        queue.close()
+
+
+def command_daemon(args):
+    """Keep clinic data fresh, revisiting pages by how often they change"""
+    from clinic_io import load_clinics, read_url_file
+    from refresh_scheduler import RefreshHistory, run_daemon
+    history = RefreshHistory(args.history)
+    scraper = build_scraper(args)
+    try:
+        if args.previous:
+            history.import_records(load_clinics(args.previous))
+        if args.urls:
+            history.add_urls(read_url_file(args.urls))
+        run_daemon(history, scraper, args.fetches_per_hour, args.tick, args.output, args.max_ticks)
+    except KeyboardInterrupt:
+        print("Stopping refresh daemon")
+    finally:
+        scraper.close()
+        history.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Clinic data pipeline')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    discover = subparsers.add_parser('discover', help='Find clinics via search results or directory pages')
+    discover.add_argument('--query', action='append', default=[], help='Search query (repeatable)')
+    discover.add_argument('--queries', help='File with one search query per line')
+    discover.add_argument('--method', choices=['selenium', 'direct', 'requests'], default='selenium')
+    discover.add_argument('--max-results', type=int, default=100)
+    discover.add_argument('--output', default='modoo_clinic_titles.txt', help='Where to save search result titles')
+    discover.add_argument('--directory', action='append', default=[], help='Directory page URL (repeatable)')
+    discover.add_argument('--directories', help='File with one directory page URL per line')
+    discover.add_argument('--urls-output', default='clinic_urls.txt', help='Where to save clinic URLs')
+    add_transport_arguments(discover)
+    discover.set_defaults(handler=command_discover)
+
+    scrape = subparsers.add_parser('scrape', help='Scrape clinic pages')
+    scrape.add_argument('url', nargs='*', help='Clinic URLs')
+    scrape.add_argument('--urls', help='File with one URL per line')
+    scrape.add_argument('--previous', help="Previous run's JSON; unchanged pages reuse its data")
+    scrape.add_argument('--output', default='clinics.json')
+    scrape.add_argument('--csv', help='Also write a CSV file')
+    scrape.add_argument('--columnar', help='Also write a column-wise file (.parquet needs pyarrow)')
+    add_transport_arguments(scrape)
+    scrape.set_defaults(handler=command_scrape)
+
+    reextract = subparsers.add_parser('reextract', help="Re-scrape a dataset's URLs with full extraction")
+    reextract.add_argument('input')
+    reextract.add_argument('--output', help='Defaults to overwriting the input')
+    add_transport_arguments(reextract)
+    reextract.set_defaults(handler=command_reextract)
+
+    export = subparsers.add_parser('export', help='Convert clinics JSON to CSV')
+    export.add_argument('input')
+    export.add_argument('output')
+    export.set_defaults(handler=command_export)
+
+    normalize = subparsers.add_parser('normalize', help='Re-normalize phones and addresses in a dataset')
+    normalize.add_argument('input')
+    normalize.add_argument('--output', help='Defaults to overwriting the input')
+    normalize.set_defaults(handler=command_normalize)
+
+    geocode = subparsers.add_parser('geocode', help='Add lat/lng to clinics (KAKAO_API_KEY selects Kakao)')
+    geocode.add_argument('input')
+    geocode.add_argument('--output', help='Defaults to overwriting the input')
+    geocode.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    geocode.set_defaults(handler=command_geocode)
+
+    dedupe = subparsers.add_parser('dedupe', help='Merge duplicate clinics found under different URLs')
+    dedupe.add_argument('input')
+    dedupe.add_argument('--output', help='Defaults to overwriting the input')
+    dedupe.set_defaults(handler=command_dedupe)
+
+    index = subparsers.add_parser('index', help='Build the static search index for the site')
+    index.add_argument('input')
+    index.add_argument('--output-dir', default=DEFAULT_INDEX_DIR)
+    index.set_defaults(handler=command_index)
+
+    queue = subparsers.add_parser('queue', help='Distributed crawl over a shared SQLite queue')
+    queue.add_argument('--queue', default=DEFAULT_QUEUE_PATH, help='Path to the shared queue database')
+    queue.add_argument('--host-delay', type=float, default=DEFAULT_QUEUE_HOST_DELAY, help='Seconds between fetches to one host')
+    queue_commands = queue.add_subparsers(dest='queue_command', required=True)
+    enqueue = queue_commands.add_parser('enqueue', help='Coordinator: load URLs into the queue')
+    enqueue.add_argument('--urls', help='File with one URL per line')
+    enqueue.add_argument('--directory', action='append', default=[], help='Directory page to harvest URLs from')
+    enqueue.add_argument('--requeue', action='store_true', help='Reset finished jobs for a new refresh cycle')
+    add_transport_arguments(enqueue)
+    work = queue_commands.add_parser('work', help='Worker: scrape until the queue is drained')
+    work.add_argument('--worker-id', help='Defaults to hostname-pid')
+    add_transport_arguments(work)
+    queue_export = queue_commands.add_parser('export', help='Write collected results to JSON')
+    queue_export.add_argument('output')
+    queue_commands.add_parser('status', help='Show job counts by status')
+    queue.set_defaults(handler=command_queue)
+
+    daemon = subparsers.add_parser('daemon', help='Continuously refresh clinics under a fetch budget')
+    daemon.add_argument('--history', default=DEFAULT_HISTORY_PATH, help='Per-URL change history database')
+    daemon.add_argument('--urls', help='File with URLs to start tracking')
+    daemon.add_argument('--previous', help='Earlier JSON output to seed fingerprints and fetch times from')
+    daemon.add_argument('--output', help='JSON file rewritten with current records after each batch')
+    daemon.add_argument('--fetches-per-hour', type=float, default=DEFAULT_FETCHES_PER_HOUR)
+    daemon.add_argument('--tick', type=float, default=DEFAULT_TICK_SECONDS, help='Seconds between scheduling rounds')
+    daemon.add_argument('--max-ticks', type=int, help='Stop after this many rounds (default: run forever)')
+    add_transport_arguments(daemon)
+    daemon.set_defaults(handler=command_daemon)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import csv
+import json
+
+# Columns written to CSV exports, in order
+CSV_FIELDNAMES = ['name', 'phone', 'address', 'services', 'description', 'url', 'scraped_at', 'content_fingerprint']
+
+
+def load_clinics(filename):
+    """Load clinic records from a JSON file"""
+    with open(filename, 'r', encoding='utf-8') as jsonfile:
+        return json.load(jsonfile)
+
+
+def save_clinics_json(clinics, filename):
+    """Save clinic records to JSON"""
+    with open(filename, 'w', encoding='utf-8') as jsonfile:
+        json.dump(clinics, jsonfile, ensure_ascii=False, indent=2)
+    print(f"Saved {len(clinics)} clinics to {filename}")
+
+
+def save_clinics_csv(clinics, filename):
+    """Save clinic records to CSV, joining the services list"""
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES, extrasaction='ignore')
+
+        writer.writeheader()
+        for clinic in clinics:
+            # Convert services list to string
+            clinic_copy = clinic.copy()
+            clinic_copy['services'] = ', '.join(clinic['services']) if clinic.get('services') else ''
+            writer.writerow(clinic_copy)
+
+    print(f"Saved {len(clinics)} clinics to {filename}")
+
+
+def save_clinics_columnar(columns, filename, service_vocabulary):
+    """Save column lists (see clinic_scraper.records_to_columns)
+
+    .parquet files need pyarrow; anything else is written as column-wise
+    JSON. The service vocabulary is stored alongside so services_mask bits
+    can be decoded.
+    """
+    count = len(next(iter(columns.values()), []))
+    if filename.endswith('.parquet'):
+        # Imported here so loading this module stays cheap
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet output")
+        table = pa.table(columns).replace_schema_metadata(
+            {'service_vocabulary': json.dumps(service_vocabulary, ensure_ascii=False)}
+        )
+        pq.write_table(table, filename)
+    else:
+        with open(filename, 'w', encoding='utf-8') as jsonfile:
+            json.dump({'service_vocabulary': service_vocabulary, 'columns': columns}, jsonfile, ensure_ascii=False)
+    print(f"Saved {count} clinics to {filename}")
+
+
+def read_url_file(filename):
+    """One URL per line; blank lines and # comments are skipped"""
+    with open(filename, 'r', encoding='utf-8') as urlfile:
+        return [line.strip() for line in urlfile if line.strip() and not line.startswith('#')]
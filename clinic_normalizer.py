@@ -0,0 +1,226 @@
+import json
+import re
+
+# Address cleaning patterns, compiled once and shared by every caller
+WHITESPACE_PATTERN = re.compile(r'\s+')
+ADDRESS_PREFIX_PATTERN = re.compile(
+    r'^(?:주소:|위치:|Address:|Location:|찾아오시는길:|오시는길:|주소|위치|Address|Location|\*|＊)\s*'
+)
+EMBEDDED_PHONE_PATTERN = re.compile(r'\b\d{2,3}[-.\s]?\d{3,4}[-.\s]?\d{4}\b')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# Standalone Korean words that are not part of addresses, and everything up to the next comma
+NON_ADDRESS_WORDS_PATTERN = re.compile(r'\b(?:전화번호|연락처|문의|예약|상담|진료|영업|운영)[:\s]*[^,]*')
+DOUBLE_COMMA_PATTERN = re.compile(r'\s*,\s*,\s*')
+
+# Address validation patterns
+ADDRESS_INDICATOR_PATTERN = re.compile('|'.join(re.escape(indicator) for indicator in [
+    # Administrative divisions
+    '시', '도', '구', '군', '동', '면', '읍', '리',
+    # Street types
+    '로', '길', '대로', 'ro', 'Road', 'Street', 'Ave', 'Avenue',
+    # Building types
+    '빌딩', '타워', '센터', '병원', '의원', 'Building', 'Tower', 'Center',
+    # Floor/room indicators
+    '층', '호', '실', 'Floor', 'floor',
+    # Major cities and areas
+    '서울', '부산', '대구', '인천', '광주', '대전', '울산', '경기', '강남',
+    'Seoul', 'Busan', 'Daegu', 'Incheon', 'Gwangju', 'Daejeon', 'Ulsan',
+    'Gangnam', 'gu', 'Gu', 'dong', 'Dong', 'South Korea', 'Republic of Korea',
+    # Common area names in clinic addresses
+    'Nonhyeon', 'Teheran', 'Samseong', 'Yanghwa', 'Mapo', 'Seocho',
+    'District', 'Disctrict'  # Include common typo
+]))
+NON_ADDRESS_PATTERN = re.compile('|'.join(re.escape(indicator) for indicator in [
+    'email', '@', 'http', 'www', '전화', '연락처', 'tel:', 'phone',
+    '진료시간', '영업시간', '운영시간', 'hours', 'time', 'consultation',
+    '예약', 'appointment', 'booking', '문의', 'inquiry', 'call', 'contact us'
+]))
+KOREAN_CHAR_PATTERN = re.compile('[ㄱ-ㅣ가-힣]')
+ENGLISH_ADDRESS_PATTERN = re.compile(r'\d+.*(?:ro|Road|Street|Ave|gu|Gu|Seoul)', re.IGNORECASE)
+DIGIT_PATTERN = re.compile(r'\d')
+ADDRESS_STRUCTURE_PATTERN = re.compile(r'\d+.*(?:로|ro|Road).*(?:구|gu|Seoul)', re.IGNORECASE)
+# Hangul order runs district first, then road and building number
+KOREAN_ADDRESS_STRUCTURE_PATTERN = re.compile(r'[가-힣](?:구|시|군)\s.*[가-힣](?:로|길)\s*\d+')
+
+# Phone normalization patterns
+PHONE_CANDIDATE_PATTERN = re.compile(r'\+?\d[\d\s().-]{6,20}\d')
+NON_DIGIT_PATTERN = re.compile(r'\D')
+# Korean area codes are 2 digits for Seoul, 3 for everything else
+SEOUL_AREA_CODE = '02'
+# 8-digit nationwide representative numbers (1588-xxxx etc.)
+REPRESENTATIVE_PREFIXES = ('15', '16', '18')
+# 050x personal/safe numbers take a 4-digit prefix (0505-123-4567, 0507-1234-5678)
+SAFE_NUMBER_PREFIX = '050'
+
+
+def clean_address(text):
+    """Clean and normalize address text"""
+    if not text:
+        return ''
+
+    # Remove extra whitespace and newlines
+    text = WHITESPACE_PATTERN.sub(' ', text).strip()
+
+    # Remove common prefixes/suffixes
+    text = ADDRESS_PREFIX_PATTERN.sub('', text, count=1)
+
+    # Remove trailing punctuation
+    text = text.rstrip('.,;:')
+
+    # Remove phone numbers, emails and non-address words that might be mixed in
+    text = EMBEDDED_PHONE_PATTERN.sub('', text)
+    text = EMAIL_PATTERN.sub('', text)
+    text = NON_ADDRESS_WORDS_PATTERN.sub('', text)
+
+    # Clean up extra spaces and commas
+    text = DOUBLE_COMMA_PATTERN.sub(', ', text)
+    text = WHITESPACE_PATTERN.sub(' ', text)
+    text = text.strip(', ')
+
+    return text.strip()
+
+
+def is_valid_address(address):
+    """Validate if the extracted text looks like a Korean address"""
+    if not address or len(address) < 10 or len(address) > 200:
+        return False
+
+    return bool(
+        ADDRESS_INDICATOR_PATTERN.search(address) and
+        (KOREAN_CHAR_PATTERN.search(address) or ENGLISH_ADDRESS_PATTERN.search(address)) and
+        DIGIT_PATTERN.search(address) and
+        not NON_ADDRESS_PATTERN.search(address.lower()) and
+        # Either has comma separators OR Korean address structure
+        (',' in address or ADDRESS_STRUCTURE_PATTERN.search(address) or
+         KOREAN_ADDRESS_STRUCTURE_PATTERN.search(address))
+    )
+
+
+def clean_addresses(texts):
+    """Clean a batch of candidate strings, doing the work once per distinct string"""
+    cache = {}
+    cleaned = []
+    for text in texts:
+        if text not in cache:
+            cache[text] = clean_address(text)
+        cleaned.append(cache[text])
+    return cleaned
+
+
+def first_valid_address(texts, min_length=0):
+    """Clean candidates in order and return the first valid address, or None"""
+    seen = set()
+    for text in texts:
+        if text in seen:
+            continue
+        seen.add(text)
+        address = clean_address(text)
+        if len(address) > min_length and is_valid_address(address):
+            return address
+    return None
+
+
+def normalize_phone(phone):
+    """Normalize a Korean phone number to domestic dashed form (e.g. 02-508-3625)"""
+    if not phone:
+        return ''
+
+    # Fields sometimes hold a paragraph of text; pick the first number-like run
+    match = PHONE_CANDIDATE_PATTERN.search(phone)
+    if not match:
+        return ''
+    raw = match.group(0)
+    digits = NON_DIGIT_PATTERN.sub('', raw)
+
+    # International form: +82 or a bare 82 (no domestic number starts with 8),
+    # optionally with a "(0)" trunk prefix
+    if raw.startswith('+82') or (digits.startswith('82') and len(digits) >= 10):
+        digits = digits[2:]
+        if digits.startswith('0'):
+            digits = digits[1:]
+        if not (len(digits) == 8 and digits.startswith(REPRESENTATIVE_PREFIXES)):
+            digits = '0' + digits
+
+    if len(digits) == 8 and digits.startswith(REPRESENTATIVE_PREFIXES):
+        return f'{digits[:4]}-{digits[4:]}'
+    safe_number = digits.startswith(SAFE_NUMBER_PREFIX) and len(digits) in (11, 12)
+    if not digits.startswith('0') or not (9 <= len(digits) <= 11 or safe_number):
+        # Not a Korean number we understand - keep it, just tidied
+        return WHITESPACE_PATTERN.sub(' ', raw).strip()
+
+    if safe_number:
+        area_length = 4
+    else:
+        area_length = 2 if digits.startswith(SEOUL_AREA_CODE) else 3
+    area, rest = digits[:area_length], digits[area_length:]
+    return f'{area}-{rest[:-4]}-{rest[-4:]}'
+
+
+def normalize_phones(phones):
+    """Normalize a batch of phone numbers, doing the work once per distinct value"""
+    cache = {}
+    normalized = []
+    for phone in phones:
+        if phone not in cache:
+            cache[phone] = normalize_phone(phone)
+        normalized.append(cache[phone])
+    return normalized
+
+
+def normalize_records(records, use_pandas=None):
+    """Re-normalize phone and address fields across a whole dataset in one pass
+
+    Uses pandas string operations for the address cleanup when it is
+    installed (or use_pandas=True); returns new record dicts.
+    """
+    # Optional and slow to import, so only loaded for dataset-wide runs
+    pd = None
+    if use_pandas or (use_pandas is None and len(records) > 1000):
+        try:
+            import pandas as pd
+        except ImportError:
+            if use_pandas:
+                raise ImportError("pandas is required for use_pandas=True")
+    use_pandas = pd is not None
+
+    phones = normalize_phones([record.get('phone', '') for record in records])
+    addresses = [record.get('address', '') or '' for record in records]
+    if use_pandas:
+        addresses = clean_address_series(pd.Series(addresses, dtype='object')).tolist()
+    else:
+        addresses = clean_addresses(addresses)
+
+    normalized = []
+    for record, phone, address in zip(records, phones, addresses):
+        record = dict(record)
+        record['phone'] = phone
+        record['address'] = address
+        normalized.append(record)
+    return normalized
+
+
+def clean_address_series(series):
+    """Vectorized clean_address over a pandas Series of strings"""
+    series = series.fillna('').str.replace(WHITESPACE_PATTERN, ' ', regex=True).str.strip()
+    series = series.str.replace(ADDRESS_PREFIX_PATTERN, '', n=1, regex=True)
+    series = series.str.rstrip('.,;:')
+    for pattern in (EMBEDDED_PHONE_PATTERN, EMAIL_PATTERN, NON_ADDRESS_WORDS_PATTERN):
+        series = series.str.replace(pattern, '', regex=True)
+    series = series.str.replace(DOUBLE_COMMA_PATTERN, ', ', regex=True)
+    series = series.str.replace(WHITESPACE_PATTERN, ' ', regex=True)
+    return series.str.strip(', ').str.strip()
+
+
+def normalize_file(input_file, output_file=None):
+    """Normalize phones and addresses in a clinics JSON file"""
+    with open(input_file, 'r', encoding='utf-8') as jsonfile:
+        records = json.load(jsonfile)
+
+    normalized = normalize_records(records)
+    changed = sum(1 for old, new in zip(records, normalized) if old != new)
+
+    output_file = output_file or input_file
+    with open(output_file, 'w', encoding='utf-8') as jsonfile:
+        json.dump(normalized, jsonfile, ensure_ascii=False, indent=2)
+    print(f"Normalized {changed}/{len(records)} clinics, saved to {output_file}")
+
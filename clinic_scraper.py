@@ -1,64 +1,748 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import time
-import csv
 import json
-from urllib.parse import urljoin, urlparse
+from urllib.parse import unquote, urljoin, urlparse
+import hashlib
+import os
 import re
+import string
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from clinic_io import load_clinics, save_clinics_columnar, save_clinics_csv, save_clinics_json
+from clinic_normalizer import clean_address, is_valid_address, first_valid_address, normalize_phone
+import gazetteer
+import script_scan
+from keyword_matcher import KeywordMatcher
+from transport_defaults import (DEFAULT_BACKOFF_FACTOR, DEFAULT_CONNECT_TIMEOUT, DEFAULT_HOST_DELAY,
+                                DEFAULT_MAX_BYTES, DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE, DEFAULT_READ_TIMEOUT)
+from fetch_planner import FetchPlanner
+from browser_pool import BrowserPool, DEFAULT_POOL_SIZE as DEFAULT_BROWSER_POOL_SIZE, looks_unrendered
+from regex_guard import DEFAULT_PAGE_SECONDS, DEFAULT_STRATEGY_SECONDS, ExtractionBudget, GuardedPattern
+from concurrency import (AdaptiveConcurrency, DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_PER_HOST, MAX_RETRY_AFTER,
+                         FAILED, NEUTRAL, OK, classify_status)
+
+# Markup that changes between otherwise identical page loads and must not
+# affect the content fingerprint
+VOLATILE_BLOCK_PATTERN = re.compile(rb'<(script|style|noscript)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+VOLATILE_COMMENT_PATTERN = re.compile(rb'<!--.*?-->', re.DOTALL)
+VOLATILE_ATTR_PATTERN = re.compile(
+    rb'\s(?:nonce|integrity|data-(?:nonce|token|csrf|timestamp|time|ts|rand|random|cache|version|v)|'
+    rb'csrf[-_]?token|_token|authenticity_token)\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)',
+    re.IGNORECASE
+)
+VOLATILE_META_PATTERN = re.compile(rb'<meta\b[^>]*(?:csrf|nonce|token)[^>]*>', re.IGNORECASE)
+VOLATILE_QUERY_PATTERN = re.compile(rb'([?&](?:v|ver|version|t|ts|_|cb|cache|timestamp)=)[\w.-]+', re.IGNORECASE)
+WHITESPACE_BYTES_PATTERN = re.compile(rb'\s+')
+
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+# Number of distinct hosts whose connection pools are kept alive
+MAX_CACHED_HOSTS = 50
+
+# Response limits - clinic pages are HTML, anything else is skipped
+STREAM_CHUNK_SIZE = 16 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+# Leading bytes of binary formats served with a wrong Content-Type
+BINARY_SIGNATURES = (b'%PDF', b'\x89PNG', b'\xff\xd8\xff', b'GIF8', b'PK\x03\x04', b'\x00\x00\x00')
+# Links that are never worth fetching as contact pages
+NON_HTML_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.mp4', '.mov',
+    '.avi', '.webm', '.mp3', '.zip', '.hwp', '.doc', '.docx', '.xls', '.xlsx'
+)
+
+# Fields every clinic record carries, in output order
+CLINIC_FIELDS = ['name', 'phone', 'address', 'services', 'description']
+DESCRIPTION_SELECTORS = ['.description', '.about', '.intro', '.clinic-intro', 'meta[name="description"]']
+# JSON-LD @type values describing the clinic itself rather than a page or article
+JSON_LD_BUSINESS_TYPES = {
+    'MedicalClinic', 'MedicalBusiness', 'MedicalOrganization', 'Hospital', 'Physician',
+    'Dentist', 'LocalBusiness', 'Organization', 'HealthAndBeautyBusiness', 'BeautySalon',
+    'DaySpa'
+}
+
+# Korean address patterns based on your examples, compiled once
+ADDRESS_PATTERNS = [GuardedPattern(pattern, re.IGNORECASE) for pattern in [
+    # Pattern 1: "Number, Street-name, District-gu, Seoul, Country" (note the comma after number)
+    r'\d+,\s+[A-Za-z가-힣-]+(?:ro|로|Road|Street|Ave|Avenue),?\s+[A-Za-z가-힣-]+(?:gu|구|Gu|dong|Dong),?\s+(?:Seoul|서울),?\s*(?:South\s+Korea|Republic\s+of\s+Korea|대한민국)?',
+
+    # Pattern 2: "Number Street-name, District-gu, Seoul, South Korea" (with optional floor info)
+    r'\d+\s+[A-Za-z가-힣-]+(?:ro|로|Road|Street|Ave|Avenue),?\s+[A-Za-z가-힣-]+(?:gu|구|Gu|dong|Dong),?\s+(?:Seoul|서울),?\s*(?:South\s+Korea|Republic\s+of\s+Korea)?(?:\s*\([^)]+\))?',
+
+    # Pattern 3: "Building Name Floor, Number Street-name, District-gu, Seoul"
+    r'[A-Za-z가-힣\s]+(?:Building|Tower|Center|빌딩|타워|센터)\s+\d+(?:st|nd|rd|th)?\s+Floor,?\s+\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|daero|대로),?\s+[A-Za-z가-힣-]+(?:gu|구|Gu),?\s+(?:Seoul|서울),?\s*(?:South\s+Korea|Republic\s+of\s+Korea)?',
+
+    # Pattern 4: "Number Street-name, Floor info, District, Seoul" (Floor in middle)
+    r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|Road|Street),?\s+\d+(?:st|nd|rd|th)?\s+Floor,?\s+[A-Za-z가-힣-]+(?:gu|구|District|Disctrict),?\s+(?:Seoul|서울)',
+
+    # Pattern 5: Korean format "Number Street-name, District, Seoul"
+    r'\d+,?\s*[가-힣A-Za-z-]+(?:로|길|대로),?\s+[가-힣A-Za-z-]+(?:구|시|동),?\s+(?:서울|Seoul)(?:\s*,?\s*(?:South\s+Korea|Republic\s+of\s+Korea|대한민국))?',
+
+    # Pattern 6: Full Korean address
+    r'서울특?별?시\s+[가-힣]+구\s+[가-힣\s]+(?:로|길|대로)\s*\d+[-\d\s]*(?:[가-힣\s\d,()]+)?',
+
+    # Pattern 7: Simple format "Number-ro, District-gu, Seoul"
+    r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|길),?\s+[A-Za-z가-힣-]+(?:gu|구),?\s+(?:Seoul|서울)',
+
+    # Pattern 8: Address with building and floor in parentheses
+    r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로),?\s+[A-Za-z가-힣-]+(?:gu|구),?\s+(?:Seoul|서울)(?:\s*\([^)]*[Ff]loor[^)]*\))?',
+
+    # Pattern 9: Other major Korean cities
+    r'\d+[-\d\s]*,?\s*[가-힣A-Za-z\s]+(?:로|길|Road|Street),?\s*[가-힣A-Za-z\s]+(?:구|시|동|District),?\s*(?:부산|대구|인천|광주|대전|울산|Busan|Daegu|Incheon)',
+
+    # Pattern 10: Gangnam specific (very common for plastic surgery) - with comma variations
+    r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로),?\s+강남(?:구|gu|Gu),?\s*(?:서울|Seoul)?',
+
+    # Pattern 11: Flexible pattern with typos like "Disctrict" instead of "District"
+    r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|Road|Street),?\s*(?:\d+(?:st|nd|rd|th)?\s*Floor,?\s*)?[A-Za-z가-힣-]+(?:gu|구|District|Disctrict),?\s*(?:Seoul|서울|Gangnam|강남)',
+
+    # Pattern 12: Very flexible catch-all pattern
+    r'(?:\*\s*)?\d+,?\s*[A-Za-z가-힣-]+(?:ro|로),?\s*(?:\d+(?:st|nd|rd|th)?\s*Floor,?\s*)?[A-Za-z가-힣\s-]+(?:gu|구|District|Disctrict),?\s*(?:Seoul|서울)',
+
+    # Pattern 13: Full Korean address in any si/do from the gazetteer
+    r'(?:' + '|'.join(gazetteer.sido_names()) + r')(?:특별시|광역시|특별자치시|특별자치도|도)?\s+[가-힣]+(?:구|시|군)\s+(?:[가-힣]+(?:구|읍|면)\s+)?[가-힣\d]+(?:로|길|대로)\s*\d+[-\d\s]*(?:[가-힣\s\d,()]+)?',
+
+    # Pattern 14: Romanized address outside Seoul "Number Street-ro, District-gu, City"
+    r'\d+,?\s*[A-Za-z-]+(?:ro|gil|daero),?\s+(?:[A-Za-z-]+(?:gu|si|gun|dong),?\s+){1,2}(?:' + '|'.join(gazetteer.sido_names(romanized=True)) + r')(?:,?\s*(?:South\s+Korea|Republic\s+of\s+Korea))?'
+]]
+
+# Very broad patterns to catch addresses the main cascade misses
+LENIENT_ADDRESS_PATTERNS = [GuardedPattern(pattern, re.IGNORECASE | re.DOTALL) for pattern in [
+    # Any text with street number + "ro" + district/city indicators
+    r'\b\d+,?\s*[A-Za-z가-힣-]+(?:ro|로)[^.]*?(?:gu|구|Seoul|서울|Gangnam|강남)',
+    
+    # Any text with known street numbers from the examples
+    r'\b(?:835|640)[^.]*?(?:Nonhyeon|Samseong)[^.]*?(?:Gangnam|Seoul)',
+    
+    # Capture larger chunks that contain address elements
+    r'[^.]*?\b\d+,?\s*[A-Za-z가-힣-]+(?:ro|로)[^.]*?(?:Seoul|서울)[^.]*',
+]]
+
+# Procedure vocabulary: canonical service name -> spellings in Hangul and Latin
+PROCEDURE_SYNONYMS = {
+    'Plastic Surgery': ['성형외과', 'plastic surgery'],
+    'Dermatology': ['피부과', 'dermatology'],
+    'Botox': ['보톡스', 'botox', 'botulinum'],
+    'Filler': ['필러', 'filler'],
+    'Lifting': ['리프팅', '실리프팅', 'lifting', 'thread lift'],
+    'Laser': ['레이저', 'laser'],
+    'Blepharoplasty': ['쌍꺼풀', '쌍커풀', '눈성형', 'blepharoplasty', 'double eyelid', 'eyelid surgery'],
+    'Rhinoplasty': ['코성형', 'rhinoplasty', 'nose surgery', 'nose job'],
+    'Facial Contouring': ['안면윤곽', 'facial contouring', 'jaw reduction', 'cheekbone reduction'],
+    'Orthognathic Surgery': ['양악수술', 'orthognathic', 'two jaw surgery', 'double jaw surgery'],
+    'Breast': ['가슴성형', '가슴확대', 'breast'],
+    'Liposuction': ['지방흡입', 'liposuction'],
+    'Fat Grafting': ['지방이식', 'fat grafting', 'fat transfer'],
+    'Facelift': ['안면거상', 'facelift', 'face lift'],
+}
+PROCEDURE_MATCHER = KeywordMatcher({
+    spelling: service
+    for service, spellings in PROCEDURE_SYNONYMS.items()
+    for spelling in spellings
+})
+
+# Link text / URL fragments that lead to a clinic's address, best first.
+# about/information pages rarely carry the address, so they only count
+# when nothing better exists.
+CONTACT_KEYWORD_WEIGHTS = {
+    '오시는길': 10, '찾아오시는길': 10, '오시는 길': 10, 'directions': 10, 'location': 9,
+    'find us': 9, 'map': 8, '위치': 8, '약도': 8, 'contact': 7, '연락처': 6, 'address': 6,
+    '주소': 6, 'visit': 4, '방문': 4, 'clinic-info': 3, 'about': 1, 'information': 1,
+}
+CONTACT_MATCHER = KeywordMatcher(CONTACT_KEYWORD_WEIGHTS)
+# Short keywords that only count as a whole word, not inside 'sitemap' or 'bitmap'
+WHOLE_WORD_KEYWORDS = {'map'}
+WORD_CHARS = set(string.ascii_letters + string.digits)
+# Sitemap entries need a real location keyword, not about/information
+MIN_SITEMAP_SCORE = 4
+
+
+def contact_score(*texts):
+    """Best keyword weight found in any of the texts, 0 if none"""
+    return max(
+        (
+            weight for text in texts for start, end, weight in CONTACT_MATCHER.iter_matches(text)
+            if is_keyword_match(text, start, end)
+        ),
+        default=0
+    )
+
+
+def is_keyword_match(text, start, end):
+    """False for whole-word keywords found inside a longer word"""
+    if text[start:end].lower() not in WHOLE_WORD_KEYWORDS:
+        return True
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return before not in WORD_CHARS and after not in WORD_CHARS
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header; HTTP-date values are ignored"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class CappedRetry(Retry):
+    """urllib3 Retry that waits at most MAX_RETRY_AFTER for a Retry-After header
+
+    The last Retry-After seen is kept on the retry state, so the fetch path
+    can hand it to the concurrency controller even when a later attempt
+    succeeded.
+    """
+
+    def __init__(self, *args, retry_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+    def new(self, **kwargs):
+        kwargs.setdefault('retry_after', self.retry_after)
+        return super().new(**kwargs)
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if response is not None:
+            retry.retry_after = self.get_retry_after(response) or retry.retry_after
+        return retry
+
+
+class UnsupportedResponseError(Exception):
+    """Raised when a response is not an HTML page worth parsing"""
+    pass
+
+
+class RobotsDisallowedError(Exception):
+    """Raised when robots.txt does not allow fetching a URL"""
+    pass
+
+
+# Canonical procedures get fixed bits so service filters are a single AND
+SERVICE_VOCABULARY = list(PROCEDURE_SYNONYMS)
+SERVICE_BITS = {service: 1 << bit for bit, service in enumerate(SERVICE_VOCABULARY)}
+SCRAPED_AT_FORMAT = '%Y-%m-%d %H:%M:%S'
+SHARED_SOURCES = {}
+
+
+def services_mask(services):
+    """Bitmask of the canonical procedures among services"""
+    mask = 0
+    for service in services:
+        mask |= SERVICE_BITS.get(service, 0)
+    return mask
+
+
+def parse_scraped_at(value):
+    """Epoch seconds from an int or a SCRAPED_AT_FORMAT string, 0 if unknown"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(time.mktime(time.strptime(value, SCRAPED_AT_FORMAT)))
+    except (TypeError, ValueError):
+        return 0
+
+
+class ClinicRecord:
+    """One scraped clinic, kept compact for large runs
+
+    Services are an interned tuple in page order plus a bitmask over
+    SERVICE_VOCABULARY for filtering; scraped_at is epoch seconds (0 when
+    unknown) and field sources a tuple aligned with CLINIC_FIELDS. to_dict()
+    gives the JSON/CSV shape the rest of the pipeline reads.
+    """
+    __slots__ = ('name', 'phone', 'address', 'services_mask', 'service_names', 'description',
+                 'url', 'scraped_at', 'content_fingerprint', 'sources', 'extraction_flags', 'extra')
+    # Keys of the dict form; anything else goes to extra
+    DICT_FIELDS = CLINIC_FIELDS + ['url', 'scraped_at', 'content_fingerprint', 'field_sources', 'extraction_flags']
+
+    def __init__(self, name='', phone='', address='', services=(), description='', url='',
+                 scraped_at=0, content_fingerprint='', field_sources=None, extraction_flags=(), extra=None):
+        self.name = name
+        self.phone = phone
+        self.address = address
+        self.services_mask = services_mask(services)
+        self.service_names = tuple(sys.intern(service) for service in services)
+        self.description = description
+        self.url = url
+        self.scraped_at = parse_scraped_at(scraped_at)
+        self.content_fingerprint = content_fingerprint
+        field_sources = field_sources or {}
+        sources = tuple(field_sources.get(field) or None for field in CLINIC_FIELDS)
+        # Few source combinations exist, so records share one tuple per combination
+        self.sources = SHARED_SOURCES.setdefault(sources, sources)
+        self.extraction_flags = tuple(extraction_flags)
+        # Keys added by later stages (lat/lng, ...) survive a reuse round trip
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {field: data[field] for field in cls.DICT_FIELDS if data.get(field) is not None}
+        extra = {key: value for key, value in data.items() if key not in cls.DICT_FIELDS}
+        return cls(**known, extra=extra)
+
+    @property
+    def services(self):
+        return list(self.service_names)
+
+    @property
+    def other_services(self):
+        """Free-text menu items outside SERVICE_VOCABULARY"""
+        return tuple(service for service in self.service_names if service not in SERVICE_BITS)
+
+    @property
+    def field_sources(self):
+        return dict(zip(CLINIC_FIELDS, self.sources))
+
+    def has_services(self, mask):
+        """True if the clinic offers every procedure in mask (see services_mask)"""
+        return self.services_mask & mask == mask
+
+    def refreshed(self):
+        """Copy with scraped_at set to now, for pages that have not changed"""
+        record = ClinicRecord.__new__(ClinicRecord)
+        for slot in self.__slots__:
+            setattr(record, slot, getattr(self, slot))
+        record.extra = dict(self.extra) if self.extra else None
+        record.scraped_at = int(time.time())
+        return record
+
+    def to_dict(self):
+        data = {
+            'name': self.name,
+            'phone': self.phone,
+            'address': self.address,
+            'services': self.services,
+            'description': self.description,
+            'url': self.url,
+            'scraped_at': (
+                time.strftime(SCRAPED_AT_FORMAT, time.localtime(self.scraped_at)) if self.scraped_at else ''
+            ),
+            'content_fingerprint': self.content_fingerprint,
+            'field_sources': self.field_sources,
+        }
+        if self.extraction_flags:
+            data['extraction_flags'] = list(self.extraction_flags)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+def records_to_columns(records):
+    """Column-oriented view of records: services as bitmasks, timestamps as ints (None if unknown)"""
+    columns = {field: [] for field in (
+        'name', 'phone', 'address', 'services_mask', 'other_services', 'description',
+        'url', 'scraped_at', 'content_fingerprint'
+    )}
+    for record in records:
+        for field, values in columns.items():
+            value = getattr(record, field)
+            if field == 'other_services':
+                value = list(value)
+            elif field == 'scraped_at':
+                value = value or None
+            values.append(value)
+    return columns
+
 
 class ClinicScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, previous_records=None, pool_size=DEFAULT_POOL_SIZE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 http2=False, max_bytes=DEFAULT_MAX_BYTES, respect_robots=True,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, max_per_host=DEFAULT_MAX_PER_HOST,
+                 host_delay=DEFAULT_HOST_DELAY, page_budget=DEFAULT_PAGE_SECONDS,
+                 strategy_budget=DEFAULT_STRATEGY_SECONDS, render_js=False, browsers=DEFAULT_BROWSER_POOL_SIZE):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_bytes = max_bytes
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = self.build_session(pool_size, max_retries, backoff_factor)
+        # Retries and redirect hops are requests too; fetch budgets count them
+        self.extra_requests = 0
+        self.session.hooks['response'].append(self.count_extra_requests)
         # Set a realistic user agent
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # Optional HTTP/2 client; falls back to the requests session if unavailable
+        self.http2_client = self.build_http2_client(pool_size, max_retries) if http2 else None
+        # robots.txt / sitemap.xml aware planning, cached per host
+        self.planner = None
+        if respect_robots:
+            self.planner = FetchPlanner(self.session, self.session.headers['User-Agent'], self.timeout)
+        # Headless Chrome tier for pages that only render client-side
+        self.browser_pool = BrowserPool(browsers, read_timeout) if render_js else None
+        self.rendered_pages = 0
+        # Per-host and global request limits, adapted to latency and errors
+        self.concurrency = AdaptiveConcurrency(max_concurrency, max_per_host, host_delay)
+        # Seconds of extraction allowed per page and per address strategy
+        self.page_budget = page_budget
+        self.strategy_budget = strategy_budget
+        # Page being scraped by the current thread: URL for debug output, extraction budget
+        self.local = threading.local()
+        self.lock = threading.Lock()
         self.clinics = []
+        # Records from the previous run, keyed by URL, used to skip extraction
+        # for pages whose content fingerprint has not changed
+        self.previous_records = {}
+        if previous_records:
+            self.set_previous_records(previous_records)
+    
+    def build_session(self, pool_size, max_retries, backoff_factor):
+        """Create a requests session with pooled connections and retry-with-backoff"""
+        retry = CappedRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,  # Covers connection resets mid-response
+            status=max_retries,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            backoff_factor=backoff_factor,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=MAX_CACHED_HOSTS, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def count_extra_requests(self, response, *args, **kwargs):
+        """Session response hook: count urllib3 retries and redirects that will be followed"""
+        retries = getattr(response.raw, 'retries', None)
+        extra = len(retries.history) if retries is not None else 0
+        extra += response.is_redirect
+        if extra:
+            with self.lock:
+                self.extra_requests += extra
+    
+    def build_http2_client(self, pool_size, max_retries):
+        """Create an httpx client with HTTP/2 multiplexing, if httpx[http2] is installed"""
+        try:
+            import httpx
+            transport = httpx.HTTPTransport(
+                http2=True,
+                retries=max_retries,  # httpx only retries failed connects
+                limits=httpx.Limits(max_connections=pool_size * MAX_CACHED_HOSTS,
+                                    max_keepalive_connections=pool_size)
+            )
+            return httpx.Client(
+                transport=transport,
+                headers=dict(self.session.headers),
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                follow_redirects=True
+            )
+        except ImportError:
+            print("HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1")
+            return None
+    
+    def fetch(self, url):
+        """GET a URL and return its body, streamed and capped at max_bytes"""
+        if self.planner is not None:
+            if not self.planner.can_fetch(url):
+                raise RobotsDisallowedError(f"robots.txt disallows {url}")
+            # Honor the host's crawl-delay before every request
+            self.planner.wait_turn(url)
+        
+        # The concurrency controller learns from how every request went
+        host = urlparse(url).netloc.lower()
+        self.concurrency.acquire(host)
+        started = time.time()
+        outcome, retry_after = FAILED, None
+        try:
+            content, retry_after = self.download(url)
+            outcome = OK
+            return content
+        except UnsupportedResponseError:
+            outcome = NEUTRAL
+            raise
+        except Exception as e:
+            # requests and httpx status errors both carry the response
+            response = getattr(e, 'response', None)
+            if response is not None:
+                outcome = classify_status(response.status_code)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            raise
+        finally:
+            self.concurrency.release(host, time.time() - started, outcome, retry_after)
+    
+    def download(self, url):
+        """Stream one response body over HTTP/1.1 or HTTP/2
+        
+        Returns the body and the last Retry-After (seconds) the host sent
+        while it was retried, if any.
+        """
+        if self.http2_client is None:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                retries = getattr(response.raw, 'retries', None)
+                retry_after = getattr(retries, 'retry_after', None)
+                response.raise_for_status()
+                return self.read_capped(response, response.iter_content(STREAM_CHUNK_SIZE), url), retry_after
+        
+        # httpx has no status-based retry, so back off on 5xx here, honoring
+        # Retry-After up to the same cap as the urllib3 path
+        retry_after = None
+        for attempt in range(self.max_retries + 1):
+            with self.http2_client.stream('GET', url) as response:
+                with self.lock:
+                    # Retries and redirects beyond the request fetch() counted
+                    self.extra_requests += len(response.history) + (attempt > 0)
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                    requested = parse_retry_after(response.headers.get('Retry-After'))
+                    if requested is not None:
+                        retry_after = min(requested, MAX_RETRY_AFTER)
+                        time.sleep(retry_after)
+                    else:
+                        time.sleep(self.backoff_factor * (2 ** attempt))
+                    continue
+                response.raise_for_status()
+                return self.read_capped(response, response.iter_bytes(STREAM_CHUNK_SIZE), url), retry_after
+    
+    def read_capped(self, response, chunks, url):
+        """Read a streamed body, rejecting non-HTML and truncating at max_bytes"""
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise UnsupportedResponseError(f"Skipping {url}: Content-Type {content_type}")
+        
+        body = bytearray()
+        for chunk in chunks:
+            if not body and chunk.startswith(BINARY_SIGNATURES):
+                raise UnsupportedResponseError(f"Skipping {url}: binary content")
+            body.extend(chunk)
+            if len(body) >= self.max_bytes:
+                # Truncated HTML still parses; stop downloading the rest
+                print(f"  Page exceeds {self.max_bytes} bytes, truncating: {url}")
+                del body[self.max_bytes:]
+                break
+        return bytes(body)
+    
+    def close(self):
+        """Release pooled connections and browsers"""
+        self.session.close()
+        if self.http2_client is not None:
+            self.http2_client.close()
+        if self.browser_pool is not None:
+            self.browser_pool.close()
+    
+    def set_previous_records(self, records):
+        """Index previous run's records by URL for incremental scraping"""
+        records = (
+            record if isinstance(record, ClinicRecord) else ClinicRecord.from_dict(record)
+            for record in records if record
+        )
+        self.previous_records = {record.url: record for record in records if record.url}
+    
+    def load_previous_records(self, filename):
+        """Load a previous run's JSON output for incremental scraping"""
+        if not os.path.exists(filename):
+            print(f"No previous records at {filename}, doing a full scrape")
+            return
+        self.set_previous_records(load_clinics(filename))
+        print(f"Loaded {len(self.previous_records)} previous records from {filename}")
+    
+    def compute_fingerprint(self, content):
+        """Hash page content with scripts and volatile attributes stripped"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        content = VOLATILE_BLOCK_PATTERN.sub(b'', content)
+        content = VOLATILE_COMMENT_PATTERN.sub(b'', content)
+        content = VOLATILE_META_PATTERN.sub(b'', content)
+        content = VOLATILE_ATTR_PATTERN.sub(b'', content)
+        content = VOLATILE_QUERY_PATTERN.sub(rb'\1', content)
+        content = WHITESPACE_BYTES_PATTERN.sub(b' ', content)
+        return hashlib.sha256(content).hexdigest()
+    
+    def reuse_previous_record(self, url, fingerprint):
+        """Return a refreshed copy of the previous record if the page is unchanged"""
+        previous = self.previous_records.get(url)
+        if not previous or previous.content_fingerprint != fingerprint:
+            return None
+        return previous.refreshed()
     
     def scrape_clinic_page(self, url):
         """Scrape a single clinic page"""
         try:
             # Store current URL for debugging
-            self._current_url = url
+            self.local.current_url = url
+            budget = ExtractionBudget(self.page_budget, self.strategy_budget)
+            self.local.budget = budget
+            
+            content = self.fetch(url)
             
-            response = self.session.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Skip parsing and extraction entirely if the page is unchanged
+            fingerprint = self.compute_fingerprint(content)
+            unchanged = self.reuse_previous_record(url, fingerprint)
+            if unchanged:
+                print(f"  Unchanged since last run, reusing stored data")
+                return unchanged
             
-            # Extract clinic data - optimized for Korean clinic sites
+            soup = self.parse_page(url, content)
+            # Fetch waits, retries and rendering do not count against extraction time
+            budget.restart()
+            
+            # Extract clinic data - structured sources first, fallbacks only for gaps
+            fields, field_sources = self.extract_fields(soup)
             clinic_data = {
-                'name': self.extract_clinic_name(soup),
-                'phone': self.extract_phone(soup),
-                'address': self.extract_address(soup),
-                'services': self.extract_services(soup),
-                'description': self.extract_text(soup, ['.description', '.about', '.intro', '.clinic-intro', 'meta[name="description"]']),
+                **fields,
                 'url': url,
-                'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S')
+                'scraped_at': int(time.time()),
+                'content_fingerprint': fingerprint,
+                'field_sources': field_sources,
+                # Strategies cut short by the budget; the record may be partial
+                'extraction_flags': budget.flags
             }
             
             # If no address found on main page, try to find contact/location pages
             if not clinic_data['address']:
-                contact_urls = self.find_contact_pages(soup, url)
+                # The sitemap names the location page directly; anchors fill in the rest
+                contact_urls = self.sitemap_contact_urls(url)
+                contact_urls += [u for u in self.find_contact_pages(soup, url) if u not in contact_urls]
                 for contact_url in contact_urls[:2]:  # Try up to 2 contact pages
                     print(f"  Trying contact page: {contact_url}")
                     try:
-                        contact_response = self.session.get(contact_url)
-                        contact_response.raise_for_status()
-                        contact_soup = BeautifulSoup(contact_response.content, 'html.parser')
-                        contact_address = self.extract_address(contact_soup)
+                        contact_soup = self.parse_page(contact_url, self.fetch(contact_url))
+                        budget.restart()
+                        contact_address, source = self.extract_address_with_source(contact_soup)
                         if contact_address:
                             clinic_data['address'] = contact_address
+                            field_sources['address'] = f'contact-page:{source}'
                             print(f"  Found address on contact page: {contact_address}")
                             break
                     except Exception as e:
                         print(f"  Error scraping contact page {contact_url}: {str(e)}")
                         continue
             
-            return clinic_data
+            return ClinicRecord(**clinic_data)
             
         except Exception as e:
             print(f"Error scraping {url}: {str(e)}")
             return None
+        finally:
+            self.local.budget = None
+    
+    def request_count(self):
+        """HTTP requests made so far: pages, contact pages, renders, robots.txt, sitemaps, retries and redirects"""
+        planned = self.planner.downloads if self.planner is not None else 0
+        return self.concurrency.requests + planned + self.extra_requests
+    
+    def parse_page(self, url, content):
+        """Parse a fetched page, rendering it in headless Chrome if it is a client-side app shell"""
+        soup = BeautifulSoup(content, 'html.parser')
+        if self.browser_pool is None or not looks_unrendered(soup):
+            return soup
+        
+        print(f"  Page looks client-rendered, rendering with headless Chrome")
+        # Hold a host slot so rendering respects the same per-host limits;
+        # render time says nothing about server load, so it is not learned from
+        host = urlparse(url).netloc.lower()
+        self.concurrency.acquire(host)
+        try:
+            rendered = self.browser_pool.render(url)
+        finally:
+            self.concurrency.release(host, 0, NEUTRAL)
+        if not rendered:
+            return soup
+        with self.lock:
+            self.rendered_pages += 1
+        return BeautifulSoup(rendered, 'html.parser')
+    
+    def current_budget(self):
+        """Extraction budget of the page this thread is scraping, if any"""
+        return getattr(self.local, 'budget', None)
+    
+    def strategy(self, name):
+        """Time-box one extraction strategy; a no-op outside scrape_clinic_page"""
+        budget = self.current_budget()
+        return budget.strategy(name) if budget is not None else nullcontext()
+    
+    def extract_fields(self, soup):
+        """Fill every field from structured sources, then run fallbacks for the rest
+        
+        Returns the field values and the source each one came from.
+        """
+        fields, field_sources = self.extract_structured_fields(soup)
+        
+        # Expensive fallbacks only run for fields the structured sources missed
+        fallbacks = [
+            ('name', lambda: self.extract_clinic_name(soup), 'selectors'),
+            ('phone', lambda: self.extract_phone(soup), 'selectors'),
+            ('services', lambda: self.extract_services(soup), 'selectors'),
+            ('description', lambda: self.extract_text(soup, DESCRIPTION_SELECTORS), 'selectors'),
+        ]
+        for field, extract, source in fallbacks:
+            if not fields.get(field):
+                fields[field] = extract()
+                field_sources[field] = source if fields[field] else None
+        
+        if not fields.get('address'):
+            fields['address'], field_sources['address'] = self.extract_address_with_source(
+                soup, include_structured=False
+            )
+        
+        fields['phone'] = normalize_phone(fields['phone'])
+        return {field: fields.get(field, '') for field in CLINIC_FIELDS}, field_sources
+    
+    def extract_structured_fields(self, soup):
+        """Read JSON-LD, meta tags, microdata and tel: links in a single pass"""
+        fields = {}
+        field_sources = {}
+        
+        def fill(field, value, source):
+            if value and not fields.get(field):
+                fields[field] = value
+                field_sources[field] = source
+        
+        # JSON-LD: the clinic's own entity carries most fields
+        json_ld = self.parse_json_ld(soup)
+        for item in json_ld:
+            item_types = item.get('@type', [])
+            if isinstance(item_types, str):
+                item_types = [item_types]
+            is_business = any(t in JSON_LD_BUSINESS_TYPES for t in item_types)
+            if not (is_business or 'address' in item or 'telephone' in item):
+                continue
+            if is_business and isinstance(item.get('name'), str):
+                fill('name', ' '.join(item['name'].split()), 'json-ld')
+            if isinstance(item.get('telephone'), str):
+                fill('phone', item['telephone'].strip(), 'json-ld')
+            if isinstance(item.get('description'), str):
+                fill('description', ' '.join(item['description'].split()), 'json-ld')
+            services = item.get('availableService') or []
+            if isinstance(services, dict):
+                services = [services]
+            names = [s.get('name') for s in services if isinstance(s, dict) and isinstance(s.get('name'), str)]
+            fill('services', names[:10], 'json-ld')
+        fill('address', self.extract_json_ld_address(soup, json_ld), 'json-ld')
+        
+        # Meta tags
+        site_name = soup.select_one('meta[property="og:site_name"]')
+        if site_name:
+            fill('name', site_name.get('content', '').strip(), 'meta')
+        for selector in ['meta[name="description"]', 'meta[property="og:description"]']:
+            meta = soup.select_one(selector)
+            if meta:
+                fill('description', meta.get('content', '').strip(), 'meta')
+        fill('address', self.extract_meta_address(soup), 'meta')
+        
+        # Microdata and tel: links
+        fill('address', self.extract_schema_address(soup), 'microdata')
+        telephone = soup.select_one('[itemprop="telephone"]')
+        if telephone:
+            fill('phone', (telephone.get('content') or telephone.get_text()).strip(), 'microdata')
+        tel_link = soup.select_one('a[href^="tel:"]')
+        if tel_link:
+            fill('phone', tel_link['href'].replace('tel:', '').strip(), 'tel-link')
+        
+        return fields, field_sources
     
     def extract_text(self, soup, selectors):
         """Try multiple selectors to find text"""
@@ -97,35 +781,48 @@ class ClinicScraper:
 
     def extract_address(self, soup):
         """Enhanced address extraction for Korean clinic websites"""
+        address, source = self.extract_address_with_source(soup)
+        return address
+    
+    def extract_address_with_source(self, soup, include_structured=True):
+        """Run the address strategies in order, returning (address, strategy name)
+        
+        include_structured=False skips meta, microdata and JSON-LD when the
+        extraction planner has already checked them.
+        """
         
         # Debug: Let's see what text we're working with for problematic sites
-        url = getattr(self, '_current_url', '')
+        url = getattr(self.local, 'current_url', '')
         is_debug_site = any(site in url for site in ['jkplastic.com', 'amoaskinclinic640.com'])
         
         # 1) Check for address in meta tags or script tags (sometimes stored there)
-        meta_address = self.extract_meta_address(soup)
-        if meta_address:
-            return meta_address
+        if include_structured:
+            meta_address = self.extract_meta_address(soup)
+            if meta_address:
+                return meta_address, 'meta'
         
         # 2) First try pattern matching on the full text - this catches most plain text addresses
-        pattern_address = self.extract_pattern_address(soup)
-        if pattern_address:
-            return pattern_address
-        
-        # 3) Schema.org microdata
-        address_data = self.extract_schema_address(soup)
-        if address_data:
-            return address_data
+        with self.strategy('text-pattern'):
+            pattern_address = self.extract_pattern_address(soup)
+            if pattern_address:
+                return pattern_address, 'text-pattern'
         
-        # 4) JSON-LD structured data
-        json_ld_address = self.extract_json_ld_address(soup)
-        if json_ld_address:
-            return json_ld_address
+        if include_structured:
+            # 3) Schema.org microdata
+            address_data = self.extract_schema_address(soup)
+            if address_data:
+                return address_data, 'microdata'
+            
+            # 4) JSON-LD structured data
+            json_ld_address = self.extract_json_ld_address(soup)
+            if json_ld_address:
+                return json_ld_address, 'json-ld'
         
         # 5) Look in script tags for address data (sometimes stored in JavaScript variables)
-        script_address = self.extract_script_address(soup)
-        if script_address:
-            return script_address
+        with self.strategy('script'):
+            script_address = self.extract_script_address(soup)
+            if script_address:
+                return script_address, 'script'
         
         # 6) Common CSS selectors with Korean-specific classes
         address_selectors = [
@@ -136,30 +833,32 @@ class ClinicScraper:
             '[id*="address"]', '[id*="location"]', '[id*="contact"]'
         ]
         
-        for selector in address_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                # Look for address patterns within these elements
-                element_text = element.get_text()
-                if is_debug_site and element_text.strip():
-                    print(f"  Debug - Found {selector}: {element_text[:100]}...")
-                found_address = self.find_address_in_text(element_text)
-                if found_address:
-                    return found_address
+        with self.strategy('selectors'):
+            for selector in address_selectors:
+                elements = soup.select(selector)
+                for element in elements:
+                    # Look for address patterns within these elements
+                    element_text = element.get_text()
+                    if is_debug_site and element_text.strip():
+                        print(f"  Debug - Found {selector}: {element_text[:100]}...")
+                    found_address = self.find_address_in_text(element_text)
+                    if found_address:
+                        return found_address, 'selectors'
         
         # 7) Look in common content areas (paragraphs, divs near contact info)
-        content_elements = soup.select('p, div, span, li')
-        
-        for element in content_elements:
-            text = element.get_text().strip()
-            if len(text) > 15 and len(text) < 200:  # Reasonable length for an address
-                # Debug: Show potential address-like text
-                if is_debug_site and any(indicator in text.lower() for indicator in ['nonhyeon', 'samseong', '835', '640', 'gangnam', 'seoul']):
-                    print(f"  Debug - Potential address text: {text}")
-                
-                found_address = self.find_address_in_text(text)
-                if found_address:
-                    return found_address
+        with self.strategy('content-scan'):
+            content_elements = soup.select('p, div, span, li')
+            
+            for element in content_elements:
+                text = element.get_text().strip()
+                if len(text) > 15 and len(text) < 200:  # Reasonable length for an address
+                    # Debug: Show potential address-like text
+                    if is_debug_site and any(indicator in text.lower() for indicator in ['nonhyeon', 'samseong', '835', '640', 'gangnam', 'seoul']):
+                        print(f"  Debug - Potential address text: {text}")
+                    
+                    found_address = self.find_address_in_text(text)
+                    if found_address:
+                        return found_address, 'content-scan'
         
         # 8) If still no address found for debug sites, let's try broader patterns
         if is_debug_site:
@@ -168,16 +867,17 @@ class ClinicScraper:
             # Look for any text containing the known street numbers
             if '835' in full_text or '640' in full_text:
                 lines = full_text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if ('835' in line or '640' in line) and len(line) < 300:
-                        print(f"  Debug - Line with street number: {line}")
-                        # Try more lenient pattern matching
-                        found = self.find_address_in_text_lenient(line)
-                        if found:
-                            return found
+                with self.strategy('lenient'):
+                    for line in lines:
+                        line = line.strip()
+                        if ('835' in line or '640' in line) and len(line) < 300:
+                            print(f"  Debug - Line with street number: {line}")
+                            # Try more lenient pattern matching
+                            found = self.find_address_in_text_lenient(line)
+                            if found:
+                                return found, 'lenient'
         
-        return ''
+        return '', None
     
     def extract_meta_address(self, soup):
         """Extract address from meta tags"""
@@ -200,33 +900,22 @@ class ClinicScraper:
     
     def extract_script_address(self, soup):
         """Extract address from JavaScript variables or data"""
-        scripts = soup.find_all('script')
-        
-        for script in scripts:
-            if script.string:
-                script_text = script.string
-                
-                # Look for common JavaScript address patterns
-                js_patterns = [
-                    r'address["\']?\s*[:=]\s*["\']([^"\']{20,100})["\']',
-                    r'location["\']?\s*[:=]\s*["\']([^"\']{20,100})["\']',
-                    r'["\']address["\']?\s*[:=]\s*["\']([^"\']{20,100})["\']',
-                    r'street["\']?\s*[:=]\s*["\']([^"\']{10,100})["\']'
-                ]
-                
-                for pattern in js_patterns:
-                    matches = re.findall(pattern, script_text, re.IGNORECASE)
-                    for match in matches:
-                        cleaned = self.clean_address_text(match)
-                        if self.is_valid_korean_address(cleaned):
-                            return cleaned
+        for candidate in script_scan.address_candidates(soup, self.current_budget()):
+            cleaned = self.clean_address_text(candidate)
+            if self.is_valid_korean_address(cleaned):
+                return cleaned
         
         return None
     
     def extract_pattern_address(self, soup):
-        """Extract address using regex patterns from full page text"""
+        """Extract address using regex patterns on the page text around known place names"""
         full_text = soup.get_text(separator=' ')
-        return self.find_address_in_text(full_text)
+        # One gazetteer scan finds the spans worth verifying; the regexes never see the rest
+        for span in gazetteer.candidate_spans(full_text):
+            address = self.find_address_in_text(span)
+            if address:
+                return address
+        return None
     
     def extract_schema_address(self, soup):
         """Extract address from Schema.org microdata"""
@@ -253,59 +942,80 @@ class ClinicScraper:
         
         return None
     
-    def extract_json_ld_address(self, soup):
-        """Extract address from JSON-LD structured data"""
-        scripts = soup.find_all('script', type='application/ld+json')
-        for script in scripts:
+    def parse_json_ld(self, soup):
+        """Parse all JSON-LD blocks once into a flat list of objects"""
+        items = []
+        for script in soup.find_all('script', type='application/ld+json'):
             try:
                 data = json.loads(script.string)
-                if isinstance(data, list):
-                    data = data[0] if data else {}
-                
-                # Look for address in various JSON-LD structures
-                address = None
-                if 'address' in data:
-                    addr_obj = data['address']
-                    if isinstance(addr_obj, str):
-                        address = addr_obj
-                    elif isinstance(addr_obj, dict):
-                        # Combine address components
-                        parts = []
-                        for key in ['streetAddress', 'addressLocality', 'addressRegion']:
-                            if key in addr_obj:
-                                parts.append(str(addr_obj[key]))
-                        address = ' '.join(parts) if parts else None
-                
-                if address:
-                    cleaned = self.clean_address_text(address)
-                    if self.is_valid_korean_address(cleaned):
-                        return cleaned
-                        
-            except (json.JSONDecodeError, KeyError, TypeError):
+            except (json.JSONDecodeError, TypeError):
                 continue
+            pending = data if isinstance(data, list) else [data]
+            while pending:
+                item = pending.pop(0)
+                if not isinstance(item, dict):
+                    continue
+                items.append(item)
+                # Pages often wrap their entities in an @graph array
+                graph = item.get('@graph')
+                if isinstance(graph, list):
+                    pending.extend(graph)
+        return items
+    
+    def json_ld_address_text(self, addr_obj):
+        """Flatten a JSON-LD address value into text"""
+        if isinstance(addr_obj, str):
+            return addr_obj
+        if isinstance(addr_obj, dict):
+            # Combine address components
+            parts = []
+            for key in ['streetAddress', 'addressLocality', 'addressRegion']:
+                if key in addr_obj:
+                    parts.append(str(addr_obj[key]))
+            return ' '.join(parts) if parts else None
+        return None
+    
+    def extract_json_ld_address(self, soup, json_ld=None):
+        """Extract address from JSON-LD structured data"""
+        if json_ld is None:
+            json_ld = self.parse_json_ld(soup)
+        for data in json_ld:
+            address = self.json_ld_address_text(data.get('address'))
+            if address:
+                cleaned = self.clean_address_text(address)
+                if self.is_valid_korean_address(cleaned):
+                    return cleaned
         
         return None
     
+    def sitemap_contact_urls(self, url, limit=2):
+        """Best location/contact URLs for url's site according to its sitemap"""
+        if self.planner is None:
+            return []
+        scored = []
+        for candidate in self.planner.sitemap_urls(url):
+            score = contact_score(unquote(urlparse(candidate).path))
+            if score >= MIN_SITEMAP_SCORE:
+                scored.append((-score, len(candidate), candidate))
+        return [candidate for score, length, candidate in sorted(scored)[:limit]]
+    
     def find_contact_pages(self, soup, base_url):
-        """Find contact or location pages that might have address info"""
+        """Find contact or location pages that might have address info, best first"""
         contact_urls = []
-        
-        # Look for contact/location links
-        contact_keywords = [
-            'contact', 'location', 'directions', 'address', 'find us', 'visit',
-            '오시는길', '찾아오시는길', '위치', '연락처', '주소', '방문',
-            'about', 'clinic-info', 'information'
-        ]
+        scores = {}
         
         # Find all links
         links = soup.find_all('a', href=True)
         
         for link in links:
             href = link.get('href', '')
-            link_text = link.get_text().strip().lower()
+            if urlparse(href).path.lower().endswith(NON_HTML_EXTENSIONS):
+                continue
+            link_text = link.get_text().strip()
             
             # Check if link text or href contains contact keywords
-            if any(keyword in link_text or keyword in href.lower() for keyword in contact_keywords):
+            score = contact_score(link_text, href)
+            if score:
                 # Convert relative URLs to absolute
                 if href.startswith('/'):
                     full_url = urljoin(base_url, href)
@@ -317,28 +1027,19 @@ class ClinicScraper:
                 # Avoid duplicates and external sites
                 if full_url not in contact_urls and urlparse(full_url).netloc == urlparse(base_url).netloc:
                     contact_urls.append(full_url)
+                scores[full_url] = max(scores.get(full_url, 0), score)
         
-        return contact_urls
+        # Location pages before generic about/information pages, page order otherwise
+        return sorted(contact_urls, key=lambda u: -scores[u])
     
     def find_address_in_text_lenient(self, text):
         """More lenient address finding for debugging"""
         if not text or len(text) < 10:
             return None
             
-        # Very broad patterns to catch addresses we're missing
-        lenient_patterns = [
-            # Any text with street number + "ro" + district/city indicators
-            r'\b\d+,?\s*[A-Za-z가-힣-]+(?:ro|로)[^.]*?(?:gu|구|Seoul|서울|Gangnam|강남)',
-            
-            # Any text with known street numbers from the examples
-            r'\b(?:835|640)[^.]*?(?:Nonhyeon|Samseong)[^.]*?(?:Gangnam|Seoul)',
-            
-            # Capture larger chunks that contain address elements
-            r'[^.]*?\b\d+,?\s*[A-Za-z가-힣-]+(?:ro|로)[^.]*?(?:Seoul|서울)[^.]*',
-        ]
-        
-        for pattern in lenient_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
+        budget = self.current_budget()
+        for pattern in LENIENT_ADDRESS_PATTERNS:
+            matches = pattern.findall(text, budget)
             for match in matches:
                 cleaned = self.clean_address_text(match)
                 print(f"    Debug - Lenient match: {cleaned}")
@@ -355,146 +1056,21 @@ class ClinicScraper:
         # Clean the text first
         text = ' '.join(text.split())
         
-        # Korean address patterns based on your examples
-        patterns = [
-            # Pattern 1: "Number, Street-name, District-gu, Seoul, Country" (note the comma after number)
-            r'\d+,\s+[A-Za-z가-힣-]+(?:ro|로|Road|Street|Ave|Avenue),?\s+[A-Za-z가-힣-]+(?:gu|구|Gu|dong|Dong),?\s+(?:Seoul|서울),?\s*(?:South\s+Korea|Republic\s+of\s+Korea|대한민국)?',
-            
-            # Pattern 2: "Number Street-name, District-gu, Seoul, South Korea" (with optional floor info)
-            r'\d+\s+[A-Za-z가-힣-]+(?:ro|로|Road|Street|Ave|Avenue),?\s+[A-Za-z가-힣-]+(?:gu|구|Gu|dong|Dong),?\s+(?:Seoul|서울),?\s*(?:South\s+Korea|Republic\s+of\s+Korea)?(?:\s*\([^)]+\))?',
-            
-            # Pattern 3: "Building Name Floor, Number Street-name, District-gu, Seoul"
-            r'[A-Za-z가-힣\s]+(?:Building|Tower|Center|빌딩|타워|센터)\s+\d+(?:st|nd|rd|th)?\s+Floor,?\s+\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|daero|대로),?\s+[A-Za-z가-힣-]+(?:gu|구|Gu),?\s+(?:Seoul|서울),?\s*(?:South\s+Korea|Republic\s+of\s+Korea)?',
-            
-            # Pattern 4: "Number Street-name, Floor info, District, Seoul" (Floor in middle)
-            r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|Road|Street),?\s+\d+(?:st|nd|rd|th)?\s+Floor,?\s+[A-Za-z가-힣-]+(?:gu|구|District|Disctrict),?\s+(?:Seoul|서울)',
-            
-            # Pattern 5: Korean format "Number Street-name, District, Seoul"
-            r'\d+,?\s*[가-힣A-Za-z-]+(?:로|길|대로),?\s+[가-힣A-Za-z-]+(?:구|시|동),?\s+(?:서울|Seoul)(?:\s*,?\s*(?:South\s+Korea|Republic\s+of\s+Korea|대한민국))?',
-            
-            # Pattern 6: Full Korean address
-            r'서울특?별?시\s+[가-힣]+구\s+[가-힣\s]+(?:로|길|대로)\s*\d+[-\d\s]*(?:[가-힣\s\d,()]+)?',
-            
-            # Pattern 7: Simple format "Number-ro, District-gu, Seoul"
-            r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|길),?\s+[A-Za-z가-힣-]+(?:gu|구),?\s+(?:Seoul|서울)',
-            
-            # Pattern 8: Address with building and floor in parentheses
-            r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로),?\s+[A-Za-z가-힣-]+(?:gu|구),?\s+(?:Seoul|서울)(?:\s*\([^)]*[Ff]loor[^)]*\))?',
-            
-            # Pattern 9: Other major Korean cities
-            r'\d+[-\d\s]*,?\s*[가-힣A-Za-z\s]+(?:로|길|Road|Street),?\s*[가-힣A-Za-z\s]+(?:구|시|동|District),?\s*(?:부산|대구|인천|광주|대전|울산|Busan|Daegu|Incheon)',
-            
-            # Pattern 10: Gangnam specific (very common for plastic surgery) - with comma variations
-            r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로),?\s+강남(?:구|gu|Gu),?\s*(?:서울|Seoul)?',
-            
-            # Pattern 11: Flexible pattern with typos like "Disctrict" instead of "District"
-            r'\d+,?\s*[A-Za-z가-힣-]+(?:ro|로|Road|Street),?\s*(?:\d+(?:st|nd|rd|th)?\s*Floor,?\s*)?[A-Za-z가-힣-]+(?:gu|구|District|Disctrict),?\s*(?:Seoul|서울|Gangnam|강남)',
-            
-            # Pattern 12: Very flexible catch-all pattern
-            r'(?:\*\s*)?\d+,?\s*[A-Za-z가-힣-]+(?:ro|로),?\s*(?:\d+(?:st|nd|rd|th)?\s*Floor,?\s*)?[A-Za-z가-힣\s-]+(?:gu|구|District|Disctrict),?\s*(?:Seoul|서울)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                cleaned = self.clean_address_text(match)
-                if len(cleaned) > 15 and self.is_valid_korean_address(cleaned):
-                    return cleaned
+        budget = self.current_budget()
+        for pattern in ADDRESS_PATTERNS:
+            address = first_valid_address(pattern.findall(text, budget), min_length=15)
+            if address:
+                return address
         
         return None
     
     def clean_address_text(self, text):
         """Clean and normalize address text"""
-        if not text:
-            return ''
-        
-        # Remove extra whitespace and newlines
-        text = ' '.join(text.split())
-        
-        # Remove common prefixes/suffixes
-        prefixes_to_remove = [
-            '주소:', '위치:', 'Address:', 'Location:', '찾아오시는길:', '오시는길:',
-            '주소', '위치', 'Address', 'Location', '*', '＊'
-        ]
-        
-        for prefix in prefixes_to_remove:
-            if text.startswith(prefix):
-                text = text[len(prefix):].strip()
-                break
-        
-        # Remove trailing punctuation
-        text = text.rstrip('.,;:')
-        
-        # Remove phone numbers that might be mixed in
-        text = re.sub(r'\b\d{2,3}[-.\s]?\d{3,4}[-.\s]?\d{4}\b', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
-        
-        # Remove standalone Korean words that are not part of addresses
-        non_address_words = ['전화번호', '연락처', '문의', '예약', '상담', '진료', '영업', '운영']
-        for word in non_address_words:
-            text = re.sub(r'\b' + word + r'[:\s]*[^,]*', '', text)
-        
-        # Clean up extra spaces and commas
-        text = re.sub(r'\s*,\s*,\s*', ', ', text)  # Remove double commas
-        text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single
-        text = text.strip(', ')  # Remove leading/trailing commas and spaces
-        
-        return text.strip()
+        return clean_address(text)
     
     def is_valid_korean_address(self, address):
         """Validate if the extracted text looks like a Korean address"""
-        if not address or len(address) < 10:
-            return False
-        
-        # Check for Korean address indicators
-        korean_indicators = [
-            # Administrative divisions
-            '시', '도', '구', '군', '동', '면', '읍', '리',
-            # Street types
-            '로', '길', '대로', 'ro', 'Road', 'Street', 'Ave', 'Avenue',
-            # Building types  
-            '빌딩', '타워', '센터', '병원', '의원', 'Building', 'Tower', 'Center',
-            # Floor/room indicators
-            '층', '호', '실', 'Floor', 'floor',
-            # Major cities and areas
-            '서울', '부산', '대구', '인천', '광주', '대전', '울산', '경기', '강남',
-            'Seoul', 'Busan', 'Daegu', 'Incheon', 'Gwangju', 'Daejeon', 'Ulsan',
-            'Gangnam', 'gu', 'Gu', 'dong', 'Dong', 'South Korea', 'Republic of Korea',
-            # Common area names in clinic addresses
-            'Nonhyeon', 'Teheran', 'Samseong', 'Yanghwa', 'Mapo', 'Seocho',
-            'District', 'Disctrict'  # Include common typo
-        ]
-        
-        # Must contain at least one Korean address indicator
-        has_address_indicator = any(indicator in address for indicator in korean_indicators)
-        
-        # Should not be too long (likely not an address if over 200 characters)
-        is_reasonable_length = len(address) <= 200
-        
-        # Should contain Korean characters OR English address format with numbers
-        has_korean_chars = any('\u3131' <= char <= '\u3163' or '\uac00' <= char <= '\ud7a3' for char in address)
-        has_english_address_format = bool(re.search(r'\d+.*(?:ro|Road|Street|Ave|gu|Gu|Seoul)', address, re.IGNORECASE))
-        has_numbers = bool(re.search(r'\d+', address))  # Addresses should have numbers
-        
-        # Check for obvious non-address content
-        non_address_indicators = [
-            'email', '@', 'http', 'www', '전화', '연락처', 'tel:', 'phone',
-            '진료시간', '영업시간', '운영시간', 'hours', 'time', 'consultation',
-            '예약', 'appointment', 'booking', '문의', 'inquiry', 'call', 'contact us'
-        ]
-        
-        has_non_address_content = any(indicator in address.lower() for indicator in non_address_indicators)
-        
-        # Additional check: should look like an address structure
-        # Either has comma separators OR Korean address structure
-        has_address_structure = (',' in address or 
-                               bool(re.search(r'\d+.*(?:로|ro|Road).*(?:구|gu|Seoul)', address, re.IGNORECASE)))
-        
-        return (has_address_indicator and is_reasonable_length and 
-                (has_korean_chars or has_english_address_format) and 
-                has_numbers and not has_non_address_content and has_address_structure)
+        return is_valid_address(address)
 
     def extract_phone(self, soup):
         """Extract phone number from various locations"""
@@ -566,19 +1142,9 @@ class ClinicScraper:
                 if text and len(text) < 100:
                     services.append(text)
         
-        # Look for common Korean plastic surgery terms
+        # Look for common Korean plastic surgery terms - one scan over the page text
         if not services:
-            text = soup.get_text()
-            korean_procedures = [
-                '성형외과', '피부과', '보톡스', '필러', '리프팅', '레이저',
-                '쌍꺼풀', '코성형', '안면윤곽', '가슴성형', '지방흡입',
-                'Botox', 'Filler', 'Lifting', 'Laser', 'Rhinoplasty',
-                'Blepharoplasty', 'Breast', 'Liposuction', 'Facelift'
-            ]
-            
-            for procedure in korean_procedures:
-                if procedure in text:
-                    services.append(procedure)
+            services.extend(PROCEDURE_MATCHER.matches(soup.get_text()))
         
         # Remove duplicates and clean up
         services = list(set(services))
@@ -589,9 +1155,7 @@ class ClinicScraper:
     def scrape_directory_page(self, directory_url):
         """Scrape a directory page to find clinic URLs"""
         try:
-            response = self.session.get(directory_url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(self.fetch(directory_url), 'html.parser')
             
             # Find clinic links - customize based on directory structure
             clinic_links = []
@@ -618,81 +1182,58 @@ class ClinicScraper:
             print(f"Error scraping directory {directory_url}: {str(e)}")
             return []
     
-    def scrape_multiple_clinics(self, urls, delay=2):
-        """Scrape multiple clinic URLs with delay"""
-        for i, url in enumerate(urls):
+    def scrape_multiple_clinics(self, urls):
+        """Scrape clinic URLs in parallel, paced by the adaptive concurrency limits"""
+        def scrape(numbered):
+            i, url = numbered
             print(f"Scraping {i+1}/{len(urls)}: {url}")
-            
             clinic_data = self.scrape_clinic_page(url)
             if clinic_data:
-                self.clinics.append(clinic_data)
-                print(f"✓ Scraped: {clinic_data['name']}")
-                if clinic_data['address']:
-                    print(f"  Address: {clinic_data['address']}")
+                print(f"✓ Scraped: {clinic_data.name}")
+                if clinic_data.address:
+                    print(f"  Address: {clinic_data.address}")
                 else:
                     print(f"  ⚠️ No address found")
-            
-            # Be respectful - add delay between requests
-            if i < len(urls) - 1:  # Don't sleep after last request
-                time.sleep(delay)
+            return clinic_data
+        
+        # Workers beyond the current limit simply wait in acquire()
+        with ThreadPoolExecutor(max_workers=self.concurrency.max_concurrency) as executor:
+            self.clinics.extend(clinic for clinic in executor.map(scrape, enumerate(urls)) if clinic)
+        self.print_report()
+    
+    def print_report(self):
+        """Summary of the run and the concurrency limits it settled on"""
+        stats = self.concurrency.snapshot()
+        print(f"\nScraped {len(self.clinics)} clinics, "
+              f"{sum(1 for clinic in self.clinics if clinic.address)} with an address")
+        print(f"Concurrency: limit {stats['limit']}, {stats['unhealthy_hosts']} unhealthy hosts")
+        if self.rendered_pages:
+            print(f"Rendered {self.rendered_pages} client-side pages with headless Chrome")
+        for host, host_stats in sorted(stats['hosts'].items()):
+            print(f"  {host}: limit {host_stats['limit']}, {host_stats['requests']} requests, "
+                  f"{host_stats['latency_ms']} ms, error rate {host_stats['error_rate']}")
+        flagged = [clinic for clinic in self.clinics if clinic.extraction_flags]
+        if flagged:
+            print(f"{len(flagged)} pages hit the extraction budget (results may be partial):")
+            for clinic in flagged:
+                print(f"  {clinic.url}: {', '.join(clinic.extraction_flags)}")
     
     def save_to_csv(self, filename='clinics.csv'):
         """Save scraped data to CSV"""
         if not self.clinics:
             print("No data to save")
             return
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['name', 'phone', 'address', 'services', 'description', 'url', 'scraped_at']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for clinic in self.clinics:
-                # Convert services list to string
-                clinic_copy = clinic.copy()
-                clinic_copy['services'] = ', '.join(clinic['services']) if clinic['services'] else ''
-                writer.writerow(clinic_copy)
-        
-        print(f"Saved {len(self.clinics)} clinics to {filename}")
+        save_clinics_csv([clinic.to_dict() for clinic in self.clinics], filename)
     
     def save_to_json(self, filename='clinics.json'):
         """Save scraped data to JSON"""
-        with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(self.clinics, jsonfile, ensure_ascii=False, indent=2)
-        print(f"Saved {len(self.clinics)} clinics to {filename}")
+        save_clinics_json([clinic.to_dict() for clinic in self.clinics], filename)
+    
+    def save_to_columnar(self, filename='clinics.parquet'):
+        """Save scraped data column-wise (Parquet if pyarrow is installed)"""
+        save_clinics_columnar(records_to_columns(self.clinics), filename, SERVICE_VOCABULARY)
 
-# Example usage
+# Example usage - see cli.py for the full command line
 if __name__ == "__main__":
-    scraper = ClinicScraper()
-    
-    # Test URLs for Korean plastic surgery clinics
-    test_urls = [
-        "https://www.jkplastic.com/en/",
-        "https://faceplusclinic.com/",
-        "https://enlienjang.com/",
-        "https://eng.banobagi.com/",
-        "https://www.vippskorea.com/",
-        "https://jwbeauty.net/",
-        "https://cdubeauty.com/",
-        "https://en.atopps.com/index.php",
-        "https://braunps.com/",
-        "https://www.nanaprs.com/",
-        "https://www.girinpsen.com/",
-        "https://jwbeauty.net/",
-        "https://www.linkpskorea.com/",
-        "https://www.viewplasticsurgery.com/",
-        "http://biopskorea.com/global/eng.html",
-        "https://seoulcosmeticsurgery.com/",
-        "https://answerplasticsurgery.com/",
-        "https://en.chiups.com/",
-        "https://www.meclinic.net/",
-        "https://abplasticsurgerykorea.com/",
-        "https://wonjinbeauty.com/en/main/main.php",
-        "https://en.stkorea.co.kr/",
-        "https://eng.idhospital.com/",
-        "https://en.1mmps.com/"
-    
-    ]
-    
-    scraper.scrape_multiple_clinics(test_urls)
-    scraper.save_to_json('improved_test.json')
\ No newline at end of file
+    from cli import main
+    main(['scrape', '--urls', 'test_urls.txt', '--previous', 'improved_test.json', '--output', 'improved_test.json'])
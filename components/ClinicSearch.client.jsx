@@ -0,0 +1,83 @@
+// components/ClinicSearch.client.jsx
+'use client';
+
+import { useEffect, useState } from 'react';
+import { useSearchParams } from 'next/navigation';
+import ClinicCard from '@/components/ClinicCard';
+import { searchClinics } from '@/lib/clinicSearch';
+
+const PAGE_SIZE = 20;
+
+// Clinic list backed by the sharded index in public/data/search.
+// The server renders the first page; queries, filters (?q=, ?service=, ?gu=)
+// and "Load more" fetch only the index pieces they need.
+export default function ClinicSearch({ initialRecords = [], initialTotal = 0 }) {
+  const searchParams = useSearchParams();
+  const [query, setQuery] = useState(searchParams.get('q') || '');
+  const [limit, setLimit] = useState(PAGE_SIZE);
+  const [result, setResult] = useState({ total: initialTotal, records: initialRecords });
+  const [error, setError] = useState(null);
+
+  const filterKey = searchParams.toString();
+
+  useEffect(() => {
+    setLimit(PAGE_SIZE);
+  }, [query, filterKey]);
+
+  useEffect(() => {
+    const filters = {};
+    for (const facet of ['service', 'gu']) {
+      const values = searchParams.getAll(facet);
+      if (values.length) filters[facet] = values;
+    }
+    // The server already rendered the unfiltered first page
+    if (!query.trim() && !Object.keys(filters).length && limit === PAGE_SIZE && initialRecords.length) {
+      setResult({ total: initialTotal, records: initialRecords });
+      return;
+    }
+
+    let cancelled = false;
+    searchClinics(query, filters, { limit })
+      .then((found) => {
+        if (!cancelled) {
+          setResult(found);
+          setError(null);
+        }
+      })
+      .catch((e) => {
+        if (!cancelled) setError(e.message);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [query, filterKey, limit]);
+
+  return (
+    <>
+      <input
+        type="search"
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+        placeholder="Search clinics by name"
+        className="w-full mt-6 px-4 py-2 border border-gray-300 rounded-full shadow-sm"
+      />
+
+      {error && <p className="text-sm text-red-600 mt-2">{error}</p>}
+
+      <div className="space-y-5 flex flex-col mt-6" id="hagwon-list">
+        {result.records.map((card, i) => (
+          <ClinicCard key={card.id} {...card} priority={i === 0} />
+        ))}
+      </div>
+
+      {result.records.length < result.total && (
+        <button
+          onClick={() => setLimit(limit + PAGE_SIZE)}
+          className="mt-6 mx-auto text-sm px-4 py-2 rounded-full border border-gray-300 text-gray-600 hover:bg-gray-100 cursor-pointer"
+        >
+          Load more ({result.total - result.records.length} left)
+        </button>
+      )}
+    </>
+  );
+}
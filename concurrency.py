@@ -0,0 +1,155 @@
+import threading
+import time
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_MAX_PER_HOST = 4
+INITIAL_CONCURRENCY = 4
+# A response slower than this multiple of the host's best latency counts as congestion
+LATENCY_TOLERANCE = 2.0
+# A host whose recent error rate (EWMA) reaches this is unhealthy; the global
+# limit only backs off when more than this share of hosts are, so one bad host cannot
+# slow down all the others
+UNHEALTHY_ERROR_RATE = 0.25
+UNHEALTHY_HOST_SHARE = 0.5
+EWMA_WEIGHT = 0.2
+DECREASE_FACTOR = 0.5
+MIN_DECREASE_INTERVAL = 1.0  # Seconds; one burst of failures is one decrease
+MAX_RETRY_AFTER = 120
+
+# Outcomes reported by the fetch path
+OK = 'ok'
+THROTTLED = 'throttled'  # 429/503: the host asked us to slow down
+FAILED = 'failed'        # Other 5xx, timeouts, connection errors
+NEUTRAL = 'neutral'      # 4xx, non-HTML: says nothing about load
+
+
+def classify_status(status_code):
+    if status_code in (429, 503):
+        return THROTTLED
+    if status_code >= 500:
+        return FAILED
+    if status_code >= 400:
+        return NEUTRAL
+    return OK
+
+
+class HostState:
+    def __init__(self, min_interval):
+        self.limit = 1.0
+        self.in_flight = 0
+        self.min_interval = min_interval
+        self.next_start = 0.0
+        self.best_latency = None
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.last_decrease = 0.0
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limits for fetching, per host and overall
+
+    Every healthy response grows the limits additively (about +1 per
+    round of requests); 429/503, 5xx, timeouts and latency well above a
+    host's best seen latency cut the host's limit in half. The global
+    limit backs off when errors are widespread across hosts. Callers
+    bracket each request with acquire()/release().
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, max_per_host=DEFAULT_MAX_PER_HOST,
+                 host_interval=0):
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.host_interval = host_interval
+        self.limit = float(min(INITIAL_CONCURRENCY, max_concurrency))
+        self.in_flight = 0
+        self.unhealthy_hosts = 0
+        self.requests = 0  # Requests started, for fetch budgets
+        self.last_decrease = 0.0
+        self.hosts = {}
+        self.condition = threading.Condition()
+
+    def host(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(self.host_interval)
+        return state
+
+    def acquire(self, host):
+        """Block until a request to host fits within the limits"""
+        with self.condition:
+            state = self.host(host)
+            while True:
+                now = time.time()
+                if (self.in_flight < int(self.limit) and state.in_flight < int(state.limit)
+                        and now >= state.next_start):
+                    break
+                wait = state.next_start - now if now < state.next_start else None
+                self.condition.wait(wait)
+            self.in_flight += 1
+            self.requests += 1
+            state.in_flight += 1
+            state.next_start = now + state.min_interval
+
+    def release(self, host, latency, outcome, retry_after=None):
+        """Record how the request went and adjust the limits"""
+        with self.condition:
+            state = self.host(host)
+            self.in_flight -= 1
+            state.in_flight -= 1
+            now = time.time()
+
+            if outcome != NEUTRAL:
+                state.requests += 1
+                was_unhealthy = state.error_rate >= UNHEALTHY_ERROR_RATE
+                failed = outcome in (THROTTLED, FAILED)
+                state.error_rate += EWMA_WEIGHT * (failed - state.error_rate)
+                self.unhealthy_hosts += (state.error_rate >= UNHEALTHY_ERROR_RATE) - was_unhealthy
+            widespread_errors = self.unhealthy_hosts > UNHEALTHY_HOST_SHARE * len(self.hosts)
+
+            if outcome == OK:
+                state.latency = latency if state.latency is None else (
+                    state.latency + EWMA_WEIGHT * (latency - state.latency)
+                )
+                state.best_latency = min(latency, state.best_latency or latency)
+                if latency > LATENCY_TOLERANCE * state.best_latency:
+                    self.decrease_host(state, now)
+                else:
+                    state.limit = min(self.max_per_host, state.limit + 1 / state.limit)
+                    if not widespread_errors:
+                        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            elif outcome in (THROTTLED, FAILED):
+                self.decrease_host(state, now)
+                if widespread_errors and now - self.last_decrease >= MIN_DECREASE_INTERVAL:
+                    self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+                    self.last_decrease = now
+            # The host asked for a pause, possibly before a retry that then succeeded
+            if retry_after:
+                state.next_start = max(state.next_start, now + min(retry_after, MAX_RETRY_AFTER))
+
+            self.condition.notify_all()
+
+    def decrease_host(self, state, now):
+        # Failures that were already in flight together count once
+        if now - state.last_decrease >= max(MIN_DECREASE_INTERVAL, state.latency or 0):
+            state.limit = max(1.0, state.limit * DECREASE_FACTOR)
+            state.last_decrease = now
+
+    def snapshot(self):
+        """Current limits and health, for the run report"""
+        with self.condition:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'unhealthy_hosts': self.unhealthy_hosts,
+                'hosts': {
+                    host: {
+                        'limit': int(state.limit),
+                        'in_flight': state.in_flight,
+                        'requests': state.requests,
+                        'latency_ms': round(state.latency * 1000) if state.latency is not None else None,
+                        'error_rate': round(state.error_rate, 3),
+                    }
+                    for host, state in self.hosts.items()
+                },
+            }
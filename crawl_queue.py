@@ -0,0 +1,249 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from urllib.parse import urlparse
+
+DEFAULT_QUEUE_PATH = 'data/crawl_queue.sqlite'
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_HOST_DELAY = 2  # Seconds between fetches to the same host, across all workers
+DEFAULT_MAX_ATTEMPTS = 3
+# How long a worker keeps a host to itself after finishing a fetch there
+HOST_AFFINITY_SECONDS = 10
+
+
+class CrawlQueue:
+    """Durable crawl queue with lease/ack semantics, shared through one SQLite file
+
+    Any number of worker processes (on any machine that can open the file)
+    lease URLs, scrape them and ack the result. A lease that is not acked
+    before it expires goes back to the queue, so crashed workers lose
+    nothing. Each host is owned by one worker at a time and fetched at most
+    once per host_delay, which keeps per-site politeness across the fleet.
+
+    The database uses SQLite's default rollback journal rather than WAL,
+    which needs shared memory and so only works within one host. Put the
+    file on storage with working POSIX locks; SQLite locking is not
+    reliable on some network filesystems.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH, host_delay=DEFAULT_HOST_DELAY,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.host_delay = host_delay
+        self.max_attempts = max_attempts
+        # Autocommit mode; write transactions are opened explicitly below
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        # Switches back queues created in WAL mode
+        self.connection.execute('PRAGMA journal_mode=DELETE')
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                url TEXT PRIMARY KEY,
+                host TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                enqueued_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status_host ON jobs (status, host);
+            CREATE TABLE IF NOT EXISTS hosts (
+                host TEXT PRIMARY KEY,
+                owner TEXT,
+                owner_expires REAL,
+                next_fetch_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                worker TEXT,
+                completed_at REAL NOT NULL
+            );
+        ''')
+
+    def enqueue(self, urls):
+        """Add URLs to the queue; URLs already queued are left alone"""
+        now = time.time()
+        before = self.connection.total_changes
+        self.connection.execute('BEGIN IMMEDIATE')
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO jobs (url, host, enqueued_at) VALUES (?, ?, ?)',
+            [(url, urlparse(url).netloc.lower(), now) for url in urls if url]
+        )
+        self.connection.execute('COMMIT')
+        added = self.connection.total_changes - before
+        print(f"Enqueued {added} new URLs")
+        return added
+
+    def requeue_all(self):
+        """Reset every job to pending, e.g. to start a fresh refresh cycle"""
+        self.connection.execute('BEGIN IMMEDIATE')
+        self.connection.execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, lease_owner = NULL, lease_expires = NULL"
+        )
+        self.connection.execute('UPDATE hosts SET owner = NULL, owner_expires = NULL')
+        self.connection.execute('COMMIT')
+
+    def lease(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Lease the next URL this worker may fetch now, or return None"""
+        now = time.time()
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            # A URL whose worker died on every attempt never got nacked; give up on it here
+            self.connection.execute(
+                "UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+                "last_error = 'lease expired' WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            # Prefer hosts this worker already owns, then the oldest work
+            row = self.connection.execute('''
+                SELECT j.url, j.host FROM jobs j
+                LEFT JOIN hosts h ON h.host = j.host
+                WHERE (j.status = 'pending' OR (j.status = 'leased' AND j.lease_expires < :now))
+                  AND (h.next_fetch_at IS NULL OR h.next_fetch_at <= :now)
+                  AND (h.owner IS NULL OR h.owner = :worker OR h.owner_expires < :now)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM jobs a WHERE a.host = j.host AND a.status = 'leased'
+                        AND a.lease_expires >= :now AND a.url != j.url
+                  )
+                ORDER BY (h.owner = :worker) DESC, j.attempts, j.enqueued_at
+                LIMIT 1
+            ''', {'now': now, 'worker': worker_id}).fetchone()
+            if row is None:
+                self.connection.execute('COMMIT')
+                return None
+
+            url, host = row
+            self.connection.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE url = ?",
+                (worker_id, now + lease_seconds, url)
+            )
+            self.connection.execute(
+                'INSERT INTO hosts (host, owner, owner_expires) VALUES (?, ?, ?) '
+                'ON CONFLICT (host) DO UPDATE SET owner = excluded.owner, owner_expires = excluded.owner_expires',
+                (host, worker_id, now + lease_seconds)
+            )
+            self.connection.execute('COMMIT')
+            return url
+        except Exception:
+            self.connection.execute('ROLLBACK')
+            raise
+
+    def ack(self, url, worker_id, record):
+        """Mark a leased URL done and store its result; False if the lease was lost"""
+        now = time.time()
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            updated = self.connection.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, last_error = NULL "
+                "WHERE url = ? AND lease_owner = ?",
+                (url, worker_id)
+            ).rowcount
+            # The lease expired and another worker owns the URL and its host now
+            if updated:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO results (url, record, worker, completed_at) VALUES (?, ?, ?, ?)',
+                    (url, json.dumps(record, ensure_ascii=False), worker_id, now)
+                )
+                self.release_host(url, now)
+            self.connection.execute('COMMIT')
+        except Exception:
+            self.connection.execute('ROLLBACK')
+            raise
+        return bool(updated)
+
+    def nack(self, url, worker_id, error=''):
+        """Return a failed URL to the queue, or give up after max_attempts"""
+        now = time.time()
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            updated = self.connection.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = ? WHERE url = ? AND lease_owner = ?",
+                (self.max_attempts, str(error)[:500], url, worker_id)
+            ).rowcount
+            if updated:
+                self.release_host(url, now)
+            self.connection.execute('COMMIT')
+        except Exception:
+            self.connection.execute('ROLLBACK')
+            raise
+
+    def release_host(self, url, now):
+        """Start the host's politeness delay, keeping it with this worker a little longer"""
+        self.connection.execute(
+            'UPDATE hosts SET next_fetch_at = ?, owner_expires = ? WHERE host = ?',
+            (now + self.host_delay, now + self.host_delay + HOST_AFFINITY_SECONDS, urlparse(url).netloc.lower())
+        )
+
+    def release_worker(self, worker_id):
+        """Give up host ownership when a worker stops"""
+        self.connection.execute('UPDATE hosts SET owner = NULL, owner_expires = NULL WHERE owner = ?', (worker_id,))
+
+    def counts(self):
+        """Number of jobs in each status"""
+        return dict(self.connection.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+
+    def has_open_work(self):
+        """True while anything is pending or leased"""
+        counts = self.counts()
+        return bool(counts.get('pending') or counts.get('leased'))
+
+    def results(self):
+        """All stored result records"""
+        return [json.loads(record) for (record,) in self.connection.execute('SELECT record FROM results ORDER BY url')]
+
+    def export(self, filename):
+        """Write all results to a JSON file in the scraper's output format"""
+        records = self.results()
+        with open(filename, 'w', encoding='utf-8') as jsonfile:
+            json.dump(records, jsonfile, ensure_ascii=False, indent=2)
+        print(f"Exported {len(records)} clinics to {filename}")
+
+    def close(self):
+        self.connection.close()
+
+
+def default_worker_id():
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+def run_worker(queue, scraper, worker_id=None, lease_seconds=DEFAULT_LEASE_SECONDS, poll_interval=1.0):
+    """Lease, scrape and ack URLs until the queue has no open work left"""
+    worker_id = worker_id or default_worker_id()
+    # Fingerprints from earlier results let unchanged pages skip extraction
+    scraper.set_previous_records(queue.results())
+    processed = 0
+
+    while True:
+        url = queue.lease(worker_id, lease_seconds)
+        if url is None:
+            if not queue.has_open_work():
+                break
+            # Everything left is on hosts that are cooling down or owned by others
+            time.sleep(poll_interval)
+            continue
+
+        print(f"[{worker_id}] Scraping {url}")
+        try:
+            clinic_data = scraper.scrape_clinic_page(url)
+        except Exception as e:
+            queue.nack(url, worker_id, e)
+            continue
+        if clinic_data:
+            if queue.ack(url, worker_id, clinic_data.to_dict()):
+                processed += 1
+            else:
+                print(f"[{worker_id}] Lease on {url} expired, result dropped")
+        else:
+            queue.nack(url, worker_id, 'no data')
+
+    queue.release_worker(worker_id)
+    print(f"[{worker_id}] Queue drained, processed {processed} URLs")
+    return processed
+
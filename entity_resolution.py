@@ -0,0 +1,238 @@
+import random
+import re
+import zlib
+from urllib.parse import urlparse
+
+from clinic_normalizer import normalize_phone
+from geocoding import normalize_address_key
+
+# Phones we trust as identifiers: normalized domestic numbers only
+PHONE_KEY_PATTERN = re.compile(r'^(?:\d{2,3}-\d{3,4}-\d{4}|1[5-9]\d{2}-\d{4})$')
+MIN_ADDRESS_KEY_LENGTH = 10
+
+# Subdomains that are language/device variants of the same site
+SITE_VARIANT_SUBDOMAINS = {'www', 'en', 'eng', 'english', 'kr', 'ko', 'kor', 'm', 'mobile', 'global', 'jp', 'cn'}
+# Hosting platforms where each clinic is its own subdomain or path
+SHARED_HOSTING_DOMAINS = {'modoo.at', 'imweb.me', 'blog.naver.com', 'cafe.naver.com'}
+
+# Page titles and widget labels scraped as clinic names
+UNINFORMATIVE_NAMES = {
+    'home', 'main', 'index', 'welcome', 'intro', 'about', 'about us', 'contact', 'contact us',
+    '홈', '메인', '공유하기', '병원소개', '오시는 길', '오시는길', '진료시간', '진료시간 및 오시는 길',
+    '진료안내', '의료진 소개', '인사말', '공지사항',
+}
+# Title separators: 'Name - Page', 'Page | Name'
+TITLE_SEPARATOR_PATTERN = re.compile(r'\s+[-|:–—]+\s+|\s*\|\s*')
+# Words every clinic name shares; they say nothing about which clinic it is
+GENERIC_NAME_WORDS_PATTERN = re.compile(
+    r'\b(?:plastic|surgery|cosmetic|aesthetic|clinic|hospital|medical|center|centre|dermatology|'
+    r'korea|korean|seoul|gangnam|in|of|the|and)\b|성형외과|피부과|의원|병원|클리닉|센터',
+    re.IGNORECASE
+)
+MAX_NAME_LENGTH = 80  # Longer "names" are marketing copy picked up by a selector
+SHINGLE_SIZE = 3
+
+# MinHash/LSH: 16 bands of 2 rows put names with Jaccard >= ~0.3 in a shared bucket
+MINHASH_BANDS = 16
+MINHASH_ROWS = 2
+MINHASH_PRIME = (1 << 61) - 1
+MINHASH_PARAMETERS = [
+    (rng.randrange(1, MINHASH_PRIME), rng.randrange(0, MINHASH_PRIME))
+    for rng in [random.Random(20240615)]
+    for _ in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+# Name similarity needed to merge on a shared phone/address, and on the name alone
+NAME_MATCH_THRESHOLD = 0.5
+NAME_ONLY_THRESHOLD = 0.85
+
+MAX_BLOCK_SIZE = 50
+
+MERGED_FIELDS = ['name', 'phone', 'address', 'description']
+
+
+def phone_key(phone):
+    phone = normalize_phone(phone or '')
+    return phone if PHONE_KEY_PATTERN.match(phone) else ''
+
+
+def address_key(address):
+    key = normalize_address_key(address or '')
+    return key if len(key) >= MIN_ADDRESS_KEY_LENGTH and re.search(r'\d', key) else ''
+
+
+def domain_key(url):
+    """Site identity of a URL: en.x.com and www.x.com are the same site"""
+    parsed = urlparse(url or '')
+    labels = parsed.netloc.lower().split(':')[0].split('.')
+    while len(labels) > 2 and labels[0] in SITE_VARIANT_SUBDOMAINS:
+        labels = labels[1:]
+    host = '.'.join(labels)
+    for platform in SHARED_HOSTING_DOMAINS:
+        if host == platform:
+            # blog.naver.com/clinicname - the first path segment is the clinic
+            segment = parsed.path.strip('/').split('/')[0]
+            return f'{host}/{segment.lower()}' if segment else ''
+    return host
+
+
+def clean_name(name):
+    """The distinctive part of a scraped name, '' if it does not name a clinic"""
+    name = ' '.join((name or '').split())
+    if not name or len(name) > MAX_NAME_LENGTH:
+        return ''
+    # modoo.at and similar titles: keep the part that is not a page label
+    parts = [part for part in TITLE_SEPARATOR_PATTERN.split(name) if part.strip()]
+    parts = [part for part in parts if part.strip().lower() not in UNINFORMATIVE_NAMES]
+    if not parts:
+        return ''
+    return parts[0].strip()
+
+
+def name_shingles(name):
+    """Character shingles of the name with generic words removed"""
+    core = GENERIC_NAME_WORDS_PATTERN.sub(' ', name.lower())
+    core = re.sub(r'[^0-9a-z가-힣]', '', core)
+    if not core:
+        return set()
+    if len(core) <= SHINGLE_SIZE:
+        return {core}
+    return {core[i:i + SHINGLE_SIZE] for i in range(len(core) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingles):
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles]
+    return [min((a * value + b) % MINHASH_PRIME for value in hashes) for a, b in MINHASH_PARAMETERS]
+
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def candidate_pairs(keys, shingles):
+    """Pairs sharing a blocking key or an LSH bucket; never all-pairs"""
+    blocks = {}
+    for index, record_keys in enumerate(keys):
+        for kind, key in record_keys.items():
+            if key:
+                blocks.setdefault((kind, key), []).append(index)
+    for index, record_shingles in enumerate(shingles):
+        if not record_shingles:
+            continue
+        signature = minhash(record_shingles)
+        for band in range(MINHASH_BANDS):
+            rows = tuple(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+            blocks.setdefault(('lsh', band, rows), []).append(index)
+
+    pairs = set()
+    for members in blocks.values():
+        # A key shared by dozens of records (a platform's phone, a common
+        # name fragment) identifies nothing
+        if len(members) > MAX_BLOCK_SIZE:
+            continue
+        for position, first in enumerate(members):
+            for second in members[position + 1:]:
+                pairs.add((first, second))
+    return pairs
+
+
+def is_match(first, second, keys, shingles):
+    """Decide whether two records describe the same clinic"""
+    a, b = keys[first], keys[second]
+    similarity = jaccard(shingles[first], shingles[second])
+    # A generic or missing name cannot contradict a shared identifier
+    names_agree = not shingles[first] or not shingles[second] or similarity >= NAME_MATCH_THRESHOLD
+    same_phone = bool(a['phone']) and a['phone'] == b['phone']
+    same_address = bool(a['address']) and a['address'] == b['address']
+    conflict = (a['phone'] and b['phone'] and not same_phone) or (a['address'] and b['address'] and not same_address)
+    if same_phone and (names_agree or same_address):
+        return True
+    if same_address and names_agree and similarity > 0:
+        return True
+
+    # One site can host several branches; it only merges pages nothing tells apart
+    same_domain = bool(a['domain']) and a['domain'] == b['domain']
+    if same_domain and names_agree and not conflict:
+        return True
+
+    # Name alone, only when no identifier says they differ
+    return similarity >= NAME_ONLY_THRESHOLD and not conflict
+
+
+def merge_cluster(records):
+    """One record per clinic: the most complete record, gaps filled from the rest"""
+    ranked = sorted(
+        records,
+        key=lambda record: (
+            bool(clean_name(record.get('name'))),
+            sum(1 for field in MERGED_FIELDS if record.get(field)),
+            len(record.get('services') or []),
+            record.get('scraped_at') or '',
+        ),
+        reverse=True
+    )
+    merged = dict(ranked[0])
+    for field in MERGED_FIELDS:
+        if not merged.get(field):
+            merged[field] = next((record[field] for record in ranked if record.get(field)), '')
+    merged['name'] = next(
+        (clean_name(record.get('name')) for record in ranked if clean_name(record.get('name'))),
+        merged.get('name', '')
+    )
+    merged['services'] = list(dict.fromkeys(
+        service for record in ranked for service in (record.get('services') or [])
+    ))
+    merged['scraped_at'] = max(record.get('scraped_at') or '' for record in records)
+    alternate_urls = list(dict.fromkeys(
+        record['url'] for record in ranked[1:] if record.get('url') and record['url'] != merged.get('url')
+    ))
+    if alternate_urls:
+        merged['alternate_urls'] = alternate_urls
+    return merged
+
+
+def resolve_entities(records):
+    """Cluster duplicate clinic records and merge each cluster
+
+    Candidate pairs come from shared phone, address and site keys plus
+    MinHash/LSH buckets over name shingles, so the work grows with the
+    number of records rather than with the number of pairs.
+    """
+    keys = [
+        {
+            'phone': phone_key(record.get('phone')),
+            'address': address_key(record.get('address')),
+            'domain': domain_key(record.get('url')),
+        }
+        for record in records
+    ]
+    shingles = [name_shingles(clean_name(record.get('name'))) for record in records]
+
+    clusters = UnionFind(len(records))
+    for first, second in candidate_pairs(keys, shingles):
+        if is_match(first, second, keys, shingles):
+            clusters.union(first, second)
+
+    grouped = {}
+    for index, record in enumerate(records):
+        grouped.setdefault(clusters.find(index), []).append(record)
+    merged = [merge_cluster(group) for group in grouped.values()]
+    print(f"Resolved {len(records)} records into {len(merged)} clinics")
+    return merged
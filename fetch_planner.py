@@ -0,0 +1,193 @@
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+MAX_SITEMAP_BYTES = 5 * 1024 * 1024
+MAX_CHILD_SITEMAPS = 3
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+# robots.txt and sitemaps are re-read after this many seconds, so a
+# long-running crawl picks up changed rules and crawl delays
+PLAN_TTL = 24 * 3600
+XML_DECLARATION_PATTERN = re.compile(rb'\s*<\?xml[^>]*?encoding=["\']([A-Za-z0-9._-]+)["\'][^>]*\?>')
+
+
+def read_limited(chunks, limit):
+    """Join streamed chunks, gunzipping sitemap.xml.gz as it arrives; None past limit bytes"""
+    body = bytearray()
+    decompressor = None
+    for chunk in chunks:
+        if decompressor is None and not body and chunk[:2] == b'\x1f\x8b':
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if decompressor is not None:
+            # Bounded output per call, so a small gzip bomb cannot expand in memory
+            chunk = decompressor.decompress(chunk, limit + 1 - len(body))
+            if decompressor.unconsumed_tail:
+                return None
+        body.extend(chunk)
+        if len(body) > limit:
+            return None
+    return bytes(body)
+
+
+def parse_xml(content):
+    """Parse XML bytes in the encoding their declaration names
+
+    expat only decodes single-byte encodings and UTF-8/16 itself, so
+    EUC-KR and other multi-byte declarations are decoded here first.
+    """
+    try:
+        return ET.fromstring(content)
+    except ValueError:
+        declaration = XML_DECLARATION_PATTERN.match(content)
+        if not declaration:
+            raise
+        text = content[declaration.end():].decode(declaration.group(1).decode('ascii'), errors='replace')
+        return ET.fromstring(text)
+
+
+class HostPlan:
+    """What we know about one host: robots rules, crawl delay and sitemap URLs"""
+
+    def __init__(self, robots, crawl_delay, sitemap_urls):
+        self.robots = robots
+        self.crawl_delay = crawl_delay
+        self.sitemap_urls = sitemap_urls
+        self.next_fetch_at = 0.0
+        self.planned_at = time.time()
+
+
+class FetchPlanner:
+    """Per-host fetch planning from robots.txt and sitemap.xml
+
+    Both files are fetched once per host and cached for plan_ttl seconds.
+    The plan answers whether a URL may be fetched, how long to
+    wait before the next request to its host, and which sitemap URLs are
+    on the clinic's site.
+    """
+
+    def __init__(self, session, user_agent, timeout, min_delay=0, plan_ttl=PLAN_TTL):
+        self.session = session
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.min_delay = min_delay
+        self.plan_ttl = plan_ttl
+        self.plans = {}
+        self.host_locks = {}
+        self.downloads = 0  # robots.txt and sitemap requests, for fetch budgets
+        self.lock = threading.Lock()
+
+    def plan(self, url):
+        """Return the cached plan for url's host, building it on first use or once it is stale"""
+        parsed = urlparse(url)
+        host_key = f'{parsed.scheme}://{parsed.netloc}'
+        with self.lock:
+            plan = self.plans.get(host_key)
+            if plan is not None and not self.is_stale(plan):
+                return plan
+            host_lock = self.host_locks.setdefault(host_key, threading.Lock())
+
+        # One thread builds the plan; others for the same host wait for it
+        with host_lock:
+            with self.lock:
+                plan = self.plans.get(host_key)
+            if plan is None or self.is_stale(plan):
+                previous = plan
+                plan = self.build_plan(host_key)
+                if previous is not None:
+                    # A re-plan must not reset the host's crawl-delay schedule
+                    plan.next_fetch_at = previous.next_fetch_at
+                with self.lock:
+                    self.plans[host_key] = plan
+            return plan
+
+    def is_stale(self, plan):
+        return time.time() - plan.planned_at >= self.plan_ttl
+
+    def build_plan(self, host_key):
+        robots = RobotFileParser()
+        robots_text = self.get_text(urljoin(host_key, '/robots.txt'))
+        # Missing or unreadable robots.txt means everything is allowed
+        robots.parse(robots_text.splitlines() if robots_text else [])
+
+        crawl_delay = robots.crawl_delay(self.user_agent)
+        request_rate = robots.request_rate(self.user_agent)
+        if crawl_delay is None and request_rate:
+            crawl_delay = request_rate.seconds / request_rate.requests
+        crawl_delay = max(float(crawl_delay or 0), self.min_delay)
+
+        sitemap_locations = robots.site_maps() or [urljoin(host_key, '/sitemap.xml')]
+        sitemap_urls = self.read_sitemaps(sitemap_locations)
+        print(f"  Planned {host_key}: crawl-delay {crawl_delay}s, {len(sitemap_urls)} sitemap URLs")
+        return HostPlan(robots, crawl_delay, sitemap_urls)
+
+    def get_text(self, url):
+        """Fetch a small text resource, returning '' on any failure or if it is too large"""
+        content, encoding = self.get_bytes(url)
+        return content.decode(encoding or 'utf-8', errors='replace')
+
+    def get_bytes(self, url):
+        """Fetch a small resource as (raw bytes, declared encoding); b'' on any failure or if it is too large"""
+        with self.lock:
+            self.downloads += 1
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200:
+                    return b'', None
+                content = read_limited(response.iter_content(DOWNLOAD_CHUNK_SIZE), MAX_SITEMAP_BYTES)
+                encoding = response.encoding
+        except Exception as e:
+            print(f"  Could not fetch {url}: {str(e)}")
+            return b'', None
+        if content is None:
+            print(f"  Skipping {url}: larger than {MAX_SITEMAP_BYTES} bytes")
+            return b'', None
+        return content, encoding
+
+    def read_sitemaps(self, locations):
+        """Collect page URLs from sitemaps, following a few sitemap-index children"""
+        urls = []
+        pending = list(locations)
+        fetched = 0
+        while pending and fetched <= MAX_CHILD_SITEMAPS:
+            # Raw bytes, so the parser honors the XML declaration (often EUC-KR
+            # on Korean sites) instead of the ISO-8859-1 default for text/xml
+            content, encoding = self.get_bytes(pending.pop(0))
+            fetched += 1
+            if not content:
+                continue
+            try:
+                root = parse_xml(content)
+            except (ET.ParseError, LookupError, ValueError):
+                continue
+            locs = [element.text.strip() for element in root.iter(f'{SITEMAP_NS}loc') if element.text]
+            if root.tag == f'{SITEMAP_NS}sitemapindex':
+                pending.extend(locs)
+            else:
+                urls.extend(locs)
+        return urls
+
+    def can_fetch(self, url):
+        """True if robots.txt allows our user agent to fetch url"""
+        return self.plan(url).robots.can_fetch(self.user_agent, url)
+
+    def wait_turn(self, url):
+        """Sleep until the host's crawl delay allows the next request"""
+        plan = self.plan(url)
+        if not plan.crawl_delay:
+            return
+        with self.lock:
+            now = time.time()
+            slot = max(now, plan.next_fetch_at)
+            plan.next_fetch_at = slot + plan.crawl_delay
+        if slot > now:
+            time.sleep(slot - now)
+
+    def sitemap_urls(self, url):
+        """URLs on url's site listed in its sitemap"""
+        host = urlparse(url).netloc
+        return [candidate for candidate in self.plan(url).sitemap_urls if urlparse(candidate).netloc == host]
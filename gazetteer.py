@@ -0,0 +1,223 @@
+import string
+
+from keyword_matcher import KeywordMatcher
+
+# Korean place names in Hangul with their common romanizations.
+# SIDO entries: (hangul, [romanized forms], short name); the other tables
+# map a si/do short name to (hangul, romanized) entries
+SIDO = [
+    ('서울특별시', ['Seoul'], '서울'),
+    ('부산광역시', ['Busan'], '부산'),
+    ('대구광역시', ['Daegu'], '대구'),
+    ('인천광역시', ['Incheon'], '인천'),
+    ('광주광역시', ['Gwangju'], '광주'),
+    ('대전광역시', ['Daejeon'], '대전'),
+    ('울산광역시', ['Ulsan'], '울산'),
+    ('세종특별자치시', ['Sejong'], '세종'),
+    ('경기도', ['Gyeonggi-do', 'Gyeonggi'], '경기'),
+    ('강원특별자치도', ['Gangwon-do', 'Gangwon'], '강원'),
+    ('충청북도', ['Chungcheongbuk-do', 'Chungbuk'], '충북'),
+    ('충청남도', ['Chungcheongnam-do', 'Chungnam'], '충남'),
+    ('전북특별자치도', ['Jeollabuk-do', 'Jeonbuk'], '전북'),
+    ('전라남도', ['Jeollanam-do', 'Jeonnam'], '전남'),
+    ('경상북도', ['Gyeongsangbuk-do', 'Gyeongbuk'], '경북'),
+    ('경상남도', ['Gyeongsangnam-do', 'Gyeongnam'], '경남'),
+    ('제주특별자치도', ['Jeju-do', 'Jeju'], '제주'),
+]
+
+# Districts (gu) and cities (si) - Seoul in full, elsewhere where clinics cluster
+SIGUNGU = {
+    '서울': [
+        ('강남구', 'Gangnam'), ('강동구', 'Gangdong'), ('강북구', 'Gangbuk'), ('강서구', 'Gangseo'),
+        ('관악구', 'Gwanak'), ('광진구', 'Gwangjin'), ('구로구', 'Guro'), ('금천구', 'Geumcheon'),
+        ('노원구', 'Nowon'), ('도봉구', 'Dobong'), ('동대문구', 'Dongdaemun'), ('동작구', 'Dongjak'),
+        ('마포구', 'Mapo'), ('서대문구', 'Seodaemun'), ('서초구', 'Seocho'), ('성동구', 'Seongdong'),
+        ('성북구', 'Seongbuk'), ('송파구', 'Songpa'), ('양천구', 'Yangcheon'), ('영등포구', 'Yeongdeungpo'),
+        ('용산구', 'Yongsan'), ('은평구', 'Eunpyeong'), ('종로구', 'Jongno'), ('중구', 'Jung'),
+        ('중랑구', 'Jungnang'),
+    ],
+    '부산': [
+        ('해운대구', 'Haeundae'), ('부산진구', 'Busanjin'), ('수영구', 'Suyeong'), ('동래구', 'Dongnae'),
+        ('연제구', 'Yeonje'), ('남구', 'Nam'), ('사하구', 'Saha'), ('중구', 'Jung'), ('동구', 'Dong'),
+        ('서구', 'Seo'), ('북구', 'Buk'),
+    ],
+    '대구': [
+        ('수성구', 'Suseong'), ('달서구', 'Dalseo'), ('북구', 'Buk'), ('중구', 'Jung'), ('동구', 'Dong'),
+        ('서구', 'Seo'), ('남구', 'Nam'),
+    ],
+    '인천': [
+        ('남동구', 'Namdong'), ('연수구', 'Yeonsu'), ('부평구', 'Bupyeong'), ('미추홀구', 'Michuhol'),
+        ('중구', 'Jung'), ('동구', 'Dong'), ('서구', 'Seo'),
+    ],
+    '광주': [('서구', 'Seo'), ('광산구', 'Gwangsan'), ('동구', 'Dong'), ('남구', 'Nam'), ('북구', 'Buk')],
+    '대전': [('유성구', 'Yuseong'), ('동구', 'Dong'), ('중구', 'Jung'), ('서구', 'Seo')],
+    '울산': [('울주군', 'Ulju'), ('중구', 'Jung'), ('남구', 'Nam'), ('동구', 'Dong'), ('북구', 'Buk')],
+    '경기': [
+        ('성남시', 'Seongnam'), ('분당구', 'Bundang'), ('수원시', 'Suwon'), ('고양시', 'Goyang'),
+        ('일산동구', 'Ilsandong'), ('일산서구', 'Ilsanseo'), ('용인시', 'Yongin'), ('수지구', 'Suji'),
+        ('기흥구', 'Giheung'), ('부천시', 'Bucheon'), ('안양시', 'Anyang'), ('화성시', 'Hwaseong'),
+        ('평택시', 'Pyeongtaek'), ('의정부시', 'Uijeongbu'), ('남양주시', 'Namyangju'), ('하남시', 'Hanam'),
+    ],
+    '충북': [('청주시', 'Cheongju')],
+    '충남': [('천안시', 'Cheonan')],
+    '전북': [('전주시', 'Jeonju')],
+    '경북': [('포항시', 'Pohang')],
+    '경남': [('창원시', 'Changwon'), ('김해시', 'Gimhae')],
+    '제주': [('제주시', 'Jeju-si'), ('서귀포시', 'Seogwipo')],
+}
+
+# Neighbourhoods (dong) where clinics concentrate
+DONG = {
+    '서울': [
+        ('신사동', 'Sinsa'), ('압구정동', 'Apgujeong'), ('청담동', 'Cheongdam'), ('논현동', 'Nonhyeon'),
+        ('역삼동', 'Yeoksam'), ('삼성동', 'Samseong'), ('대치동', 'Daechi'), ('도곡동', 'Dogok'),
+        ('서초동', 'Seocho'), ('반포동', 'Banpo'), ('방배동', 'Bangbae'), ('잠실동', 'Jamsil'),
+        ('명동', 'Myeong'), ('서교동', 'Seogyo'), ('합정동', 'Hapjeong'), ('여의도동', 'Yeouido'),
+        ('목동', 'Mok'), ('신림동', 'Sillim'), ('이태원동', 'Itaewon'), ('회현동', 'Hoehyeon'),
+    ],
+    '경기': [
+        ('구미동', 'Gumi'), ('정자동', 'Jeongja'), ('서현동', 'Seohyeon'), ('수내동', 'Sunae'),
+        ('판교동', 'Pangyo'), ('백현동', 'Baekhyeon'),
+    ],
+    '부산': [('우동', 'U'), ('부전동', 'Bujeon')],
+}
+
+# Major roads (ro/daero/gil) in clinic districts
+ROADS = {
+    '서울': [
+        ('논현로', 'Nonhyeon-ro'), ('테헤란로', 'Teheran-ro'), ('강남대로', 'Gangnam-daero'),
+        ('도산대로', 'Dosan-daero'), ('압구정로', 'Apgujeong-ro'), ('언주로', 'Eonju-ro'),
+        ('선릉로', 'Seolleung-ro'), ('봉은사로', 'Bongeunsa-ro'), ('삼성로', 'Samseong-ro'),
+        ('영동대로', 'Yeongdong-daero'), ('학동로', 'Hakdong-ro'), ('청담로', 'Cheongdam-ro'),
+        ('가로수길', 'Garosu-gil'), ('서초대로', 'Seocho-daero'), ('반포대로', 'Banpo-daero'),
+        ('남부순환로', 'Nambusunhwan-ro'), ('송파대로', 'Songpa-daero'), ('올림픽로', 'Olympic-ro'),
+        ('양화로', 'Yanghwa-ro'), ('세종대로', 'Sejong-daero'), ('명동길', 'Myeongdong-gil'),
+        ('을지로', 'Eulji-ro'), ('종로', 'Jong-ro'), ('여의대로', 'Yeoui-daero'), ('목동로', 'Mokdong-ro'),
+    ],
+    '부산': [('해운대로', 'Haeundae-ro'), ('중앙대로', 'Jungang-daero'), ('서면로', 'Seomyeon-ro')],
+    '대구': [('달구벌대로', 'Dalgubeol-daero'), ('동대구로', 'Dongdaegu-ro')],
+    '경기': [
+        ('성남대로', 'Seongnam-daero'), ('황새울로', 'Hwangsaeul-ro'), ('미금일로', 'Migeumil-ro'),
+        ('돌마로', 'Dolma-ro'), ('정자일로', 'Jeongjail-ro'), ('판교역로', 'Pangyoyeok-ro'),
+    ],
+}
+
+ROMAN_SUFFIXES = {'sigungu': ('-gu', '-si', '-gun', ' gu', ' District'), 'dong': ('-dong', ' dong')}
+WORD_CHARS = set(string.ascii_letters + string.digits)
+
+_index = None
+
+
+class Place:
+    """A gazetteer entry matched in text"""
+    __slots__ = ('name', 'level', 'sido')
+
+    def __init__(self, name, level, sido):
+        self.name = name
+        self.level = level
+        self.sido = sido
+
+    def __repr__(self):
+        return f'Place({self.name!r}, {self.level!r}, {self.sido!r})'
+
+
+def iter_place_forms():
+    """Yield (surface form, Place) for every Hangul and romanized spelling"""
+    for hangul, romanized, short in SIDO:
+        place = Place(hangul, 'sido', short)
+        for form in [hangul, short] + romanized:
+            yield form, place
+
+    for level, table in (('sigungu', SIGUNGU), ('dong', DONG), ('road', ROADS)):
+        for sido, entries in table.items():
+            for hangul, roman in entries:
+                place = Place(hangul, level, sido)
+                yield hangul, place
+                if level == 'road':
+                    yield roman, place
+                    yield roman.replace('-', ' '), place
+                    continue
+                # Bare romanized district names are only unambiguous when long
+                for suffix in ROMAN_SUFFIXES[level]:
+                    yield roman + suffix, place
+                if level == 'sigungu' and len(roman) >= 5:
+                    yield roman, place
+
+
+def build_index():
+    """Build the multi-pattern matcher over all place spellings
+
+    Each spelling maps to every place of its first registered level (si/do
+    before district names), so 중구 and 남구 keep all their cities.
+    """
+    forms = {}
+    for form, place in iter_place_forms():
+        places = forms.setdefault(form, [])
+        if not places or places[0].level == place.level:
+            places.append(place)
+    return KeywordMatcher({form: tuple(places) for form, places in forms.items()})
+
+
+def get_index():
+    """Return the shared matcher, building it on first use"""
+    global _index
+    if _index is None:
+        _index = build_index()
+    return _index
+
+
+def find_places(text):
+    """Scan text once and return (start, end, Place) for every place-name mention
+
+    Overlapping matches resolve to the longest one; romanized names must sit
+    on word boundaries so 'Guro' does not match inside 'Guroo'. A name found
+    in several cities resolves to the city mentioned closest to it, or to
+    the first registered one if the text names no city.
+    """
+    matches = get_index().find_longest(text, accept=is_boundary_match)
+    sido_mentions = [(start, places[0].sido) for start, end, places in matches if places[0].level == 'sido']
+    resolved = []
+    for start, end, places in matches:
+        place = places[0]
+        if len(places) > 1:
+            for distance, sido in sorted((abs(start - position), sido) for position, sido in sido_mentions):
+                place = next((candidate for candidate in places if candidate.sido == sido), None)
+                if place:
+                    break
+            place = place or places[0]
+        resolved.append((start, end, place))
+    return resolved
+
+
+def is_boundary_match(text, start, end):
+    """Romanized matches must not be glued to surrounding Latin letters or digits"""
+    if text[start] not in WORD_CHARS and text[end - 1] not in WORD_CHARS:
+        return True
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    return before not in WORD_CHARS and after not in WORD_CHARS
+
+
+def candidate_spans(text, before=80, after=80):
+    """Return the substrings of text around place mentions, merged where they overlap"""
+    windows = []
+    for start, end, place in find_places(text):
+        window_start, window_end = max(0, start - before), min(len(text), end + after)
+        if windows and window_start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], window_end)
+        else:
+            windows.append([window_start, window_end])
+    return [text[start:end] for start, end in windows]
+
+
+def has_place(text):
+    """True if text mentions any known Korean place"""
+    return bool(find_places(text))
+
+
+def sido_names(romanized=False):
+    """All si/do spellings, for building address patterns"""
+    names = []
+    for hangul, roman, short in SIDO:
+        names.extend(roman if romanized else [hangul, short])
+    return names
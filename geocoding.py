@@ -0,0 +1,227 @@
+import json
+import os
+import re
+import sqlite3
+import time
+
+from clinic_normalizer import clean_address
+
+DEFAULT_CACHE_PATH = 'data/geocode_cache.sqlite'
+# Longest pause after consecutive geocoding errors
+MAX_ERROR_BACKOFF = 60
+# Addresses a provider could not resolve are asked again after this long
+NEGATIVE_CACHE_SECONDS = 30 * 86400
+
+# Parts of an address that do not change where it is on the map
+COUNTRY_SUFFIX_PATTERN = re.compile(r'[,\s]*(?:republic of korea|south korea|korea|대한민국)\s*$', re.IGNORECASE)
+FLOOR_PATTERN = re.compile(r'\b(?:b?\d+(?:st|nd|rd|th)?\s*floors?|\d+\s*층|지하\s*\d+\s*층)\b', re.IGNORECASE)
+PARENTHESES_PATTERN = re.compile(r'\([^)]*\)')
+PUNCTUATION_PATTERN = re.compile(r'[,.·]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_address_key(address):
+    """Reduce an address to the form used as the geocode cache key"""
+    address = clean_address(address)
+    if not address:
+        return ''
+    address = PARENTHESES_PATTERN.sub(' ', address)
+    address = COUNTRY_SUFFIX_PATTERN.sub('', address)
+    address = FLOOR_PATTERN.sub(' ', address)
+    address = PUNCTUATION_PATTERN.sub(' ', address)
+    return WHITESPACE_PATTERN.sub(' ', address).strip().lower()
+
+
+class GeocodeCache:
+    """Persistent address -> coordinates cache in SQLite
+
+    Addresses the backend could not resolve are cached too (with no
+    coordinates) so re-runs do not ask for them again. Such misses only
+    count for the provider that reported them, and only for
+    NEGATIVE_CACHE_SECONDS; a better backend or a later run retries them.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS geocodes ('
+            ' address_key TEXT PRIMARY KEY, lat REAL, lng REAL,'
+            ' provider TEXT, created_at INTEGER)'
+        )
+        self.connection.commit()
+
+    def get_many(self, keys, provider=None):
+        """Return {key: (lat, lng) or None} for the keys that are cached
+
+        Cached misses are returned only if provider reported them recently.
+        """
+        found = {}
+        keys = list(keys)
+        miss_cutoff = int(time.time()) - NEGATIVE_CACHE_SECONDS
+        # Stay well under SQLite's bound-parameter limit
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset:offset + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.connection.execute(
+                f'SELECT address_key, lat, lng, provider, created_at FROM geocodes '
+                f'WHERE address_key IN ({placeholders})', chunk
+            )
+            for key, lat, lng, found_by, created_at in rows:
+                if lat is not None:
+                    found[key] = (lat, lng)
+                elif found_by == provider and (created_at or 0) >= miss_cutoff:
+                    found[key] = None
+        return found
+
+    def put_many(self, results, provider):
+        """Store {key: (lat, lng) or None}"""
+        now = int(time.time())
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?, ?, ?)',
+            [
+                (key, coords[0] if coords else None, coords[1] if coords else None, provider, now)
+                for key, coords in results.items()
+            ]
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+class KakaoGeocoder:
+    """Kakao Local address search - best coverage for Korean addresses"""
+    name = 'kakao'
+    batch_size = 20
+    min_interval = 0.1  # Seconds between requests
+
+    def __init__(self, api_key, timeout=10):
+        import requests
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f'KakaoAK {api_key}'})
+        self.timeout = timeout
+
+    def geocode(self, address):
+        response = self.session.get(
+            'https://dapi.kakao.com/v2/local/search/address.json',
+            params={'query': address}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        documents = response.json().get('documents', [])
+        if not documents:
+            return None
+        return float(documents[0]['y']), float(documents[0]['x'])
+
+
+class NominatimGeocoder:
+    """OpenStreetMap Nominatim - free, limited to one request per second"""
+    name = 'nominatim'
+    batch_size = 10
+    min_interval = 1.0
+
+    def __init__(self, user_agent='compareclinics-geocoder', timeout=10):
+        import requests
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent})
+        self.timeout = timeout
+
+    def geocode(self, address):
+        response = self.session.get(
+            'https://nominatim.openstreetmap.org/search',
+            params={'q': address, 'format': 'json', 'limit': 1, 'countrycodes': 'kr'},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        return float(results[0]['lat']), float(results[0]['lon'])
+
+
+class StaticGeocoder:
+    """Local stand-in backend answering from a dict of address key -> (lat, lng)"""
+    name = 'static'
+    batch_size = 100
+    min_interval = 0
+
+    def __init__(self, coordinates=None):
+        self.coordinates = {
+            normalize_address_key(address): coords for address, coords in (coordinates or {}).items()
+        }
+        self.calls = 0
+
+    def geocode(self, address):
+        self.calls += 1
+        return self.coordinates.get(normalize_address_key(address))
+
+
+def geocode_records(records, geocoder, cache):
+    """Add lat/lng to clinic records, asking the backend only for uncached addresses"""
+    keys = [normalize_address_key(record.get('address', '')) for record in records]
+    # The backend gets a readable spelling of each address, not the lowercased key
+    originals = {}
+    for record, key in zip(records, keys):
+        if key:
+            originals.setdefault(key, clean_address(record['address']))
+    unique_keys = set(originals)
+    known = cache.get_many(unique_keys, geocoder.name)
+
+    # Geocode misses in rate-limited batches, saving each batch as it completes
+    missing = sorted(unique_keys - set(known))
+    if missing:
+        print(f"Geocoding {len(missing)} new addresses ({len(known)} cached) with {geocoder.name}")
+    failures = 0
+    for offset in range(0, len(missing), geocoder.batch_size):
+        batch = {}
+        for key in missing[offset:offset + geocoder.batch_size]:
+            try:
+                batch[key] = geocoder.geocode(originals[key])
+                failures = 0
+            except Exception as e:
+                # Leave it uncached so the next run retries
+                print(f"  Geocoding failed for {key}: {str(e)}")
+                failures += 1
+            finally:
+                # Errors are often the service refusing us; slow down further, never speed up
+                delay = geocoder.min_interval
+                if failures:
+                    delay = min(max(delay, 1) * 2 ** failures, MAX_ERROR_BACKOFF)
+                time.sleep(delay)
+        cache.put_many(batch, geocoder.name)
+        known.update(batch)
+
+    geocoded = []
+    for record, key in zip(records, keys):
+        record = dict(record)
+        coords = known.get(key)
+        record['lat'], record['lng'] = coords if coords else (None, None)
+        geocoded.append(record)
+    return geocoded
+
+
+def default_geocoder():
+    """Kakao when KAKAO_API_KEY is set, otherwise Nominatim"""
+    api_key = os.environ.get('KAKAO_API_KEY')
+    return KakaoGeocoder(api_key) if api_key else NominatimGeocoder()
+
+
+def geocode_file(input_file, output_file=None, geocoder=None, cache_path=DEFAULT_CACHE_PATH):
+    """Geocode every clinic in a JSON file"""
+    with open(input_file, 'r', encoding='utf-8') as jsonfile:
+        records = json.load(jsonfile)
+
+    cache = GeocodeCache(cache_path)
+    try:
+        geocoded = geocode_records(records, geocoder or default_geocoder(), cache)
+    finally:
+        cache.close()
+
+    output_file = output_file or input_file
+    with open(output_file, 'w', encoding='utf-8') as jsonfile:
+        json.dump(geocoded, jsonfile, ensure_ascii=False, indent=2)
+    located = sum(1 for record in geocoded if record['lat'] is not None)
+    print(f"Located {located}/{len(geocoded)} clinics, saved to {output_file}")
+
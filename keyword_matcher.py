@@ -0,0 +1,115 @@
+import string
+from collections import deque
+
+# Latin letters are matched case-insensitively; the table keeps string length
+# unchanged so match offsets map straight back to the original text
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class KeywordMatcher:
+    """Aho-Corasick multi-pattern matcher over Hangul and Latin text
+
+    Built once from a keyword vocabulary, then scans any text in a single
+    pass regardless of how many keywords it holds. Keywords map to a
+    payload (a canonical name, a Place, ...) so synonyms in any script
+    resolve to the same value.
+    """
+
+    def __init__(self, keywords, ignore_case=True):
+        """keywords: iterable of strings, or a dict of keyword -> payload"""
+        self.ignore_case = ignore_case
+        if not isinstance(keywords, dict):
+            keywords = {keyword: keyword for keyword in keywords}
+
+        # Node 0 is the root; each node has goto edges, a fail link and outputs
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        for keyword, payload in keywords.items():
+            self.add(keyword, payload)
+        self.build_fail_links()
+
+    def fold(self, text):
+        return text.translate(ASCII_LOWER) if self.ignore_case else text
+
+    def add(self, keyword, payload):
+        """Insert one keyword into the trie"""
+        keyword = self.fold(keyword)
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+        # First payload registered for a spelling wins
+        if not self.outputs[node]:
+            self.outputs[node].append((len(keyword), payload))
+
+    def build_fail_links(self):
+        """Breadth-first pass linking each node to its longest proper suffix in the trie"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                # Inherit matches that end at the suffix node
+                self.outputs[child] = self.outputs[child] + [
+                    output for output in self.outputs[self.fail[child]]
+                    if output not in self.outputs[child]
+                ]
+
+    def iter_matches(self, text):
+        """Yield (start, end, payload) for every keyword occurrence, overlapping included"""
+        if not text:
+            return
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        node = 0
+        for position, char in enumerate(self.fold(text)):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, payload in outputs[node]:
+                yield position + 1 - length, position + 1, payload
+
+    def find_all(self, text):
+        """All matches as a list of (start, end, payload)"""
+        return list(self.iter_matches(text))
+
+    def find_longest(self, text, accept=None):
+        """Leftmost-longest, non-overlapping matches
+
+        accept(text, start, end) can reject a match, e.g. to enforce word boundaries.
+        """
+        candidates = [
+            match for match in self.iter_matches(text)
+            if accept is None or accept(text, match[0], match[1])
+        ]
+        candidates.sort(key=lambda match: (match[0], match[0] - match[1]))
+        selected = []
+        last_end = 0
+        for start, end, payload in candidates:
+            if start >= last_end:
+                selected.append((start, end, payload))
+                last_end = end
+        return selected
+
+    def matches(self, text):
+        """Set of payloads found in text"""
+        return {payload for start, end, payload in self.iter_matches(text)}
+
+    def contains_any(self, text):
+        """True as soon as any keyword occurs in text"""
+        for match in self.iter_matches(text):
+            return True
+        return False
@@ -0,0 +1,88 @@
+// Client for the static search index written by search_index.py.
+// Only the manifest, the shards holding the query's keys and the record
+// chunks holding the hits are fetched, so lookups stay small as the
+// dataset grows.
+
+const INDEX_URL = '/data/search';
+
+const cache = new Map();
+
+function loadJson(path) {
+  if (!cache.has(path)) {
+    cache.set(
+      path,
+      fetch(`${INDEX_URL}/${path}`).then((response) => {
+        if (!response.ok) throw new Error(`Could not load ${path}`);
+        return response.json();
+      })
+    );
+  }
+  return cache.get(path);
+}
+
+export function loadManifest() {
+  return loadJson('manifest.json');
+}
+
+export function loadFacets() {
+  return loadJson('facets.json');
+}
+
+// Must match shard_for() in search_index.py
+export function shardFor(key, shardCount) {
+  let value = 0;
+  for (const char of key) {
+    value = (value * 31 + char.codePointAt(0)) % 4294967296;
+  }
+  return value % shardCount;
+}
+
+// Same tokenization as name_terms() in search_index.py, minus the prefixes:
+// the index already holds every prefix, so a query word is looked up whole
+export function queryTerms(query) {
+  const terms = new Set();
+  const text = query.toLowerCase();
+  for (const run of text.match(/[가-힣]+/g) || []) {
+    if (run.length === 1) terms.add(run);
+    for (let i = 0; i < run.length - 1; i += 1) terms.add(run.slice(i, i + 2));
+  }
+  for (const word of text.match(/[a-z0-9]+/g) || []) terms.add(word);
+  return [...terms];
+}
+
+async function postings(key, manifest) {
+  const shard = await loadJson(`shards/${shardFor(key, manifest.shard_count)}.json`);
+  return shard[key] || [];
+}
+
+function intersect(lists) {
+  if (lists.length === 0) return null;
+  const [first, ...rest] = [...lists].sort((a, b) => a.length - b.length);
+  const others = rest.map((list) => new Set(list));
+  return first.filter((id) => others.every((set) => set.has(id)));
+}
+
+// searchClinics('강남', { service: ['Botox'], gu: ['서울 강남구'] }, { limit: 20 })
+//   -> { total, records }: the match count and the first `limit` matching records
+export async function searchClinics(query = '', filters = {}, { limit = Infinity } = {}) {
+  const manifest = await loadManifest();
+  const keys = queryTerms(query).map((term) => `t:${term}`);
+  for (const [facet, values] of Object.entries(filters)) {
+    for (const value of values) keys.push(`${facet}:${value}`);
+  }
+
+  let ids = intersect(await Promise.all(keys.map((key) => postings(key, manifest))));
+  if (ids === null) {
+    ids = Array.from({ length: manifest.record_count }, (_, id) => id);
+  }
+
+  // Only the chunks holding the hits that will be shown are fetched
+  const total = ids.length;
+  ids = ids.slice(0, limit);
+  const perChunk = manifest.records_per_chunk;
+  const chunkNumbers = [...new Set(ids.map((id) => Math.floor(id / perChunk)))];
+  const chunks = await Promise.all(chunkNumbers.map((number) => loadJson(`records/${number}.json`)));
+  const records = new Map();
+  chunks.forEach((chunk) => chunk.forEach((record) => records.set(record.id, record)));
+  return { total, records: ids.map((id) => records.get(id)) };
+}
@@ -0,0 +1,238 @@
+import json
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from clinic_io import save_clinics_json
+
+DEFAULT_HISTORY_PATH = 'data/refresh_history.sqlite'
+DEFAULT_FETCHES_PER_HOUR = 120
+DEFAULT_TICK_SECONDS = 60
+DAY = 86400
+# Change rate assumed for a page until it has been revisited: about monthly
+PRIOR_CHANGE_RATE = 1 / (30 * DAY)
+# Floor for pages never seen changing, so they are still checked every few weeks
+MIN_CHANGE_RATE = 1 / (365 * DAY)
+# Pages less likely than this to have changed are not worth a fetch yet
+MIN_CHANGE_PROBABILITY = 0.05
+# Failed fetches back off from an hour up to a week
+FAILURE_BACKOFF = 3600
+MAX_FAILURE_BACKOFF = 7 * DAY
+
+
+def estimate_change_rate(revisits, changes, observed_seconds):
+    """Changes per second from revisit counts (Cho & Garcia-Molina estimator)
+
+    A revisit only shows whether the page changed at least once since the
+    previous fetch, so changes/time undercounts; -log((n - X + 0.5) /
+    (n + 0.5)) per mean interval corrects for that and stays finite when
+    every revisit saw a change.
+    """
+    if revisits <= 0 or observed_seconds <= 0:
+        return PRIOR_CHANGE_RATE
+    mean_interval = observed_seconds / revisits
+    rate = -math.log((revisits - changes + 0.5) / (revisits + 0.5)) / mean_interval
+    return max(rate, MIN_CHANGE_RATE)
+
+
+def change_probability(rate, elapsed):
+    """Chance a page changing at rate (Poisson) has changed after elapsed seconds"""
+    return 1 - math.exp(-rate * max(elapsed, 0))
+
+
+class RefreshHistory:
+    """Per-URL fetch and change history in SQLite, with each page's latest record
+
+    Every fetch is logged with whether the content fingerprint changed;
+    per-page counters feed the change-rate estimate.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                last_fetch REAL,
+                revisits INTEGER NOT NULL DEFAULT 0,
+                changes INTEGER NOT NULL DEFAULT 0,
+                observed_seconds REAL NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                retry_at REAL,
+                record TEXT
+            );
+            CREATE TABLE IF NOT EXISTS fetches (
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                changed INTEGER,
+                ok INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS fetches_url ON fetches (url, fetched_at);
+        ''')
+
+    def add_urls(self, urls):
+        """Track new URLs; they have never been fetched, so they go first"""
+        before = self.connection.total_changes
+        with self.connection:
+            self.connection.executemany('INSERT OR IGNORE INTO pages (url) VALUES (?)', [(url,) for url in urls if url])
+        added = self.connection.total_changes - before
+        print(f"Tracking {added} new URLs")
+        return added
+
+    def import_records(self, records):
+        """Seed history from an earlier run's records: their fingerprint and scrape time"""
+        from clinic_scraper import parse_scraped_at
+        rows = []
+        for record in records:
+            if not record.get('url'):
+                continue
+            rows.append((record['url'], record.get('content_fingerprint') or None,
+                         parse_scraped_at(record.get('scraped_at')) or None,
+                         json.dumps(record, ensure_ascii=False)))
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO pages (url, fingerprint, last_fetch, record) VALUES (?, ?, ?, ?)', rows
+            )
+        print(f"Imported {len(rows)} stored records")
+
+    def record_fetch(self, url, record, now=None):
+        """Log a successful fetch and whether the page changed since the last one"""
+        now = now or time.time()
+        fingerprint = record.get('content_fingerprint') or None
+        row = self.connection.execute('SELECT fingerprint, last_fetch FROM pages WHERE url = ?', (url,)).fetchone()
+        previous_fingerprint, last_fetch = row if row else (None, None)
+        # A fetch says something about the change rate only if there was an earlier one to compare with
+        compared = bool(previous_fingerprint and fingerprint and last_fetch)
+        changed = compared and fingerprint != previous_fingerprint
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO pages (url) VALUES (?) ON CONFLICT (url) DO NOTHING', (url,)
+            )
+            self.connection.execute('''
+                UPDATE pages SET fingerprint = ?, last_fetch = ?, revisits = revisits + ?, changes = changes + ?,
+                    observed_seconds = observed_seconds + ?, failures = 0, retry_at = NULL, record = ?
+                WHERE url = ?
+            ''', (fingerprint, now, int(compared), int(changed), now - last_fetch if compared else 0,
+                  json.dumps(record, ensure_ascii=False), url))
+            self.connection.execute(
+                'INSERT INTO fetches (url, fetched_at, changed, ok) VALUES (?, ?, ?, 1)',
+                (url, now, int(changed) if compared else None)
+            )
+        return changed
+
+    def record_failure(self, url, now=None):
+        """Log a failed fetch and back the URL off exponentially"""
+        now = now or time.time()
+        failures = self.connection.execute('SELECT failures FROM pages WHERE url = ?', (url,)).fetchone()
+        backoff = min(FAILURE_BACKOFF * 2 ** (failures[0] if failures else 0), MAX_FAILURE_BACKOFF)
+        with self.connection:
+            self.connection.execute(
+                'UPDATE pages SET failures = failures + 1, retry_at = ? WHERE url = ?', (now + backoff, url)
+            )
+            self.connection.execute('INSERT INTO fetches (url, fetched_at, ok) VALUES (?, ?, 0)', (url, now))
+
+    def due(self, limit, now=None, min_probability=MIN_CHANGE_PROBABILITY):
+        """Up to limit URLs most likely to have changed, as (probability, url)"""
+        now = now or time.time()
+        candidates = []
+        for url, last_fetch, revisits, changes, observed in self.connection.execute(
+            'SELECT url, last_fetch, revisits, changes, observed_seconds FROM pages '
+            'WHERE retry_at IS NULL OR retry_at <= ?', (now,)
+        ):
+            if last_fetch is None:
+                probability = 1.0
+            else:
+                rate = estimate_change_rate(revisits, changes, observed)
+                probability = change_probability(rate, now - last_fetch)
+            if probability >= min_probability:
+                candidates.append((probability, url))
+        candidates.sort(reverse=True)
+        return candidates[:limit]
+
+    def records(self):
+        """Latest record of every page fetched so far"""
+        return [
+            json.loads(record)
+            for (record,) in self.connection.execute('SELECT record FROM pages WHERE record IS NOT NULL ORDER BY url')
+        ]
+
+    def summary(self):
+        """Page count, pages ever fetched, and observed change counts"""
+        return self.connection.execute(
+            'SELECT COUNT(*), COUNT(last_fetch), SUM(revisits), SUM(changes) FROM pages'
+        ).fetchone()
+
+    def close(self):
+        self.connection.close()
+
+
+def refresh_batch(history, scraper, urls, spread_seconds=0):
+    """Scrape urls in parallel, starting them evenly over spread_seconds; returns how many changed"""
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=scraper.concurrency.max_concurrency) as executor:
+        futures = []
+        for position, url in enumerate(urls):
+            wait = started + spread_seconds * position / len(urls) - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            futures.append(executor.submit(scraper.scrape_clinic_page, url))
+        results = [future.result() for future in futures]
+
+    changed = 0
+    for url, clinic in zip(urls, results):
+        if clinic is None:
+            history.record_failure(url)
+            continue
+        # The next fetch of this page can skip extraction if it is unchanged
+        scraper.previous_records[url] = clinic
+        changed += history.record_fetch(url, clinic.to_dict())
+    return changed
+
+
+def run_daemon(history, scraper, fetches_per_hour=DEFAULT_FETCHES_PER_HOUR, tick_seconds=DEFAULT_TICK_SECONDS,
+               output=None, max_ticks=None):
+    """Revisit pages in order of change likelihood, within a fetch budget
+
+    Each tick adds fetches_per_hour * tick_seconds / 3600 fetches to the
+    allowance and spends it on the pages most likely to have changed since
+    their last fetch, 1 - exp(-rate * elapsed) with the rate estimated
+    from each page's own history. Every HTTP request counts against the
+    budget - contact pages, renders, robots.txt and sitemaps included - so
+    the number of pages per tick follows the measured requests per page,
+    and overspending is paid back in later ticks. A batch is spread over
+    its tick, and idle time does not build up into a burst.
+    """
+    scraper.set_previous_records(history.records())
+    allowance = 0.0
+    per_tick = fetches_per_hour * tick_seconds / 3600
+    requests_made = pages_refreshed = 0
+    ticks = 0
+    print(f"Refreshing at up to {fetches_per_hour} fetches/hour")
+
+    while max_ticks is None or ticks < max_ticks:
+        started = time.time()
+        fetches_per_page = requests_made / pages_refreshed if pages_refreshed else 1.0
+        # Carry over at most what one tick or one page needs
+        allowance = min(allowance + per_tick, max(per_tick, fetches_per_page))
+        due = history.due(int(allowance / fetches_per_page)) if allowance > 0 else []
+        if due:
+            urls = [url for probability, url in due]
+            before = scraper.request_count()
+            changed = refresh_batch(history, scraper, urls, tick_seconds)
+            used = scraper.request_count() - before
+            allowance -= used
+            requests_made += used
+            pages_refreshed += len(urls)
+            pages, fetched, revisits, changes = history.summary()
+            print(f"Refreshed {len(urls)} pages in {used} requests ({changed} changed, lowest change probability "
+                  f"{due[-1][0]:.2f}); {fetched}/{pages} pages fetched, {changes or 0}/{revisits or 0} revisits changed")
+            if output:
+                save_clinics_json(history.records(), output)
+        ticks += 1
+        if max_ticks is None or ticks < max_ticks:
+            time.sleep(max(0.0, tick_seconds - (time.time() - started)))
@@ -0,0 +1,136 @@
+import re
+import time
+
+try:
+    # Third-party engine with a real per-call timeout
+    import regex
+except ImportError:
+    regex = None
+
+DEFAULT_PAGE_SECONDS = 3.0
+DEFAULT_STRATEGY_SECONDS = 1.0
+# Without the regex module, long text is scanned in overlapping windows so
+# backtracking is bounded by the window size and the deadline is checked
+# between windows. A single window cannot be interrupted, and the lenient
+# patterns backtrack roughly cubically in its length: 1000 characters of
+# crafted text took over a second, 300 take about 0.05s, well inside a
+# strategy budget. Addresses are shorter than the overlap; a match longer
+# than a whole window (a lenient pattern spanning a long sentence) is not
+# found in this mode.
+WINDOW_SIZE = 300
+WINDOW_OVERLAP = 150
+
+
+class BudgetExceeded(Exception):
+    """Raised when a strategy or page runs out of extraction time"""
+    pass
+
+
+class ExtractionBudget:
+    """Time allowed for extracting one page, and for each strategy within it
+
+    Strategies run inside `with budget.strategy(name):`; a strategy that
+    runs out of time is recorded in flags and the page moves on to the
+    next one, or stops trying once the page budget is spent.
+    """
+
+    def __init__(self, page_seconds=DEFAULT_PAGE_SECONDS, strategy_seconds=DEFAULT_STRATEGY_SECONDS):
+        self.page_seconds = page_seconds
+        self.strategy_seconds = strategy_seconds
+        self.flags = []
+        self.current = None
+        self.restart()
+
+    def restart(self):
+        """Start the clock for another page (e.g. a contact page), keeping the flags"""
+        self.page_deadline = time.monotonic() + self.page_seconds
+        self.deadline = self.page_deadline
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        if self.remaining() <= 0:
+            raise BudgetExceeded(self.current or 'page')
+
+    def strategy(self, name):
+        return StrategyScope(self, name)
+
+
+class StrategyScope:
+    def __init__(self, budget, name):
+        self.budget = budget
+        self.name = name
+
+    def __enter__(self):
+        budget = self.budget
+        budget.current = self.name
+        budget.deadline = min(budget.page_deadline, time.monotonic() + budget.strategy_seconds)
+        return budget
+
+    def __exit__(self, exc_type, exc, traceback):
+        budget = self.budget
+        budget.current = None
+        budget.deadline = budget.page_deadline
+        if exc_type is BudgetExceeded:
+            exhausted = 'page-budget' if time.monotonic() >= budget.page_deadline else 'timeout'
+            budget.flags.append(f'{self.name}:{exhausted}')
+            print(f"  Extraction budget exceeded in {self.name}, skipping it")
+            return True  # Swallow: the caller continues with the next strategy
+        return False
+
+
+class GuardedPattern:
+    """Compiled pattern whose findall() gives up when the extraction budget runs out
+
+    Uses the regex module's timeout when it is installed, otherwise
+    windowed scanning with the standard re module.
+    """
+
+    def __init__(self, pattern, flags=0):
+        self.compiled = re.compile(pattern, flags)
+        self.timed = regex.compile(pattern, flags) if regex is not None else None
+
+    def findall(self, text, budget=None):
+        # Only time-boxed strategies are cut short; other callers get a plain findall
+        if budget is None or budget.current is None:
+            return self.compiled.findall(text)
+        budget.check()
+
+        if self.timed is not None:
+            try:
+                return self.timed.findall(text, timeout=max(budget.remaining(), 0.001))
+            except TimeoutError:
+                raise BudgetExceeded(budget.current or 'page')
+
+        if len(text) <= WINDOW_SIZE:
+            return self.compiled.findall(text)
+        matches = []
+        last_end = 0
+        step = WINDOW_SIZE - WINDOW_OVERLAP
+        for start in range(0, len(text), step):
+            budget.check()
+            end = min(start + WINDOW_SIZE, len(text))
+            last_window = end >= len(text)
+            for match in self.compiled.finditer(text, start, end):
+                if match.start() < last_end:
+                    continue  # Already found by the previous window
+                # A match starting in the overlap may be cut short by the edge,
+                # optional tails included; the next window sees it whole
+                if not last_window and match.start() >= start + step:
+                    break
+                if not last_window and match.end() == end:
+                    continue
+                matches.append(findall_value(match))
+                last_end = match.end()
+            if last_window:
+                break
+        return matches
+
+
+def findall_value(match):
+    """What re.findall would return for this match"""
+    groups = match.groups()
+    if not groups:
+        return match.group(0)
+    return groups[0] if len(groups) == 1 else groups
@@ -0,0 +1,142 @@
+import json
+import re
+
+from keyword_matcher import KeywordMatcher
+from regex_guard import GuardedPattern
+
+# Inline scripts longer than this are framework bundles, not page config
+MAX_SCRIPT_LENGTH = 50000
+# Total inline JavaScript run through the address regexes per page
+MAX_SCANNED_LENGTH = 200000
+# JSON state blobs are parsed, not regex-scanned, so they may be larger
+MAX_STATE_LENGTH = 2 * 1024 * 1024
+MAX_STATE_NODES = 50000
+# State assignments open the script; only its head is searched for one
+STATE_PREFIX_LENGTH = 500
+
+JSON_SCRIPT_TYPES = {'application/ld+json', 'application/json'}
+JAVASCRIPT_TYPES = {
+    '', 'text/javascript', 'application/javascript', 'application/x-javascript',
+    'text/ecmascript', 'application/ecmascript', 'module',
+}
+
+# One pass over a script tells whether it is a known tracker/bundle and
+# whether it mentions anything the address patterns could match
+SCRIPT_SIGNALS = KeywordMatcher({
+    'gtag(': 'tracker', 'googletagmanager': 'tracker', 'google-analytics': 'tracker',
+    'fbq(': 'tracker', 'connect.facebook.net': 'tracker', 'kakaoPixel': 'tracker',
+    'wcs_add': 'tracker', 'wcs_do': 'tracker', 'wcslog': 'tracker', 'hotjar': 'tracker',
+    'clarity.ms': 'tracker', 'ChannelIO': 'tracker', 'adsbygoogle': 'tracker',
+    'webpackJsonp': 'tracker', 'webpackChunk': 'tracker', '__webpack_require__': 'tracker',
+    # Every SCRIPT_ADDRESS_PATTERNS entry needs one of these keys to match
+    'address': 'address', 'location': 'address', 'street': 'address',
+})
+
+# Address assignments in JavaScript variables and config objects
+SCRIPT_ADDRESS_PATTERNS = [GuardedPattern(pattern, re.IGNORECASE) for pattern in [
+    r'address["\']?\s*[:=]\s*["\']([^"\']{20,100})["\']',
+    r'location["\']?\s*[:=]\s*["\']([^"\']{20,100})["\']',
+    r'["\']address["\']?\s*[:=]\s*["\']([^"\']{20,100})["\']',
+    r'street["\']?\s*[:=]\s*["\']([^"\']{10,100})["\']'
+]]
+
+# window.__INITIAL_STATE__ = {...} and similar server-rendered app state
+STATE_ASSIGNMENT_PATTERN = re.compile(
+    r'(?:window\.)?(?:__INITIAL_STATE__|__PRELOADED_STATE__|__APOLLO_STATE__|__NUXT__|__DATA__)\s*=\s*(?=[{\[])'
+)
+# Object keys whose values hold an address: address, roadAddress, addr1, 주소, ...
+ADDRESS_KEY_PATTERN = re.compile(r'addr|^location$|^street|주소', re.IGNORECASE)
+ADDRESS_PART_KEYS = ['streetAddress', 'addressLocality', 'addressRegion']
+
+
+def classify_script(script):
+    """'json' for data blocks, 'javascript' for inline code worth scanning, None to skip"""
+    text = script.string
+    if not text or script.get('src'):
+        return None
+    script_type = (script.get('type') or '').split(';')[0].strip().lower()
+    if script_type in JSON_SCRIPT_TYPES:
+        return 'json'
+    if script_type not in JAVASCRIPT_TYPES:
+        return None  # HTML templates and other inert blocks
+    return 'javascript'
+
+
+def address_values(data):
+    """Walk parsed JSON and yield strings stored under address-like keys"""
+    pending = [data]
+    visited = 0
+    while pending and visited < MAX_STATE_NODES:
+        node = pending.pop(0)
+        visited += 1
+        if isinstance(node, list):
+            pending.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        for key, value in node.items():
+            if isinstance(key, str) and ADDRESS_KEY_PATTERN.search(key):
+                if isinstance(value, str):
+                    yield value
+                elif isinstance(value, dict):
+                    parts = [str(value[part]) for part in ADDRESS_PART_KEYS if value.get(part)]
+                    if parts:
+                        yield ' '.join(parts)
+            if isinstance(value, (dict, list)):
+                pending.append(value)
+
+
+def parse_state(text):
+    """JSON app state assigned in an inline script, None if there is none"""
+    match = STATE_ASSIGNMENT_PATTERN.search(text, 0, STATE_PREFIX_LENGTH)
+    if not match:
+        return None
+    try:
+        data, end = json.JSONDecoder().raw_decode(text, match.end())
+    except ValueError:
+        return None  # A function call or object literal, not JSON
+    return data
+
+
+def address_candidates(soup, budget=None):
+    """Address strings from a page's inline scripts, cheapest sources first
+
+    JSON data blocks (JSON-LD, __NEXT_DATA__) and JSON state assignments
+    are parsed and walked for address-like keys. The remaining inline
+    JavaScript is regex-scanned only if it is small, is not a known
+    tracker or bundle, and mentions an address key at all.
+    """
+    scannable = []
+    for script in soup.find_all('script'):
+        kind = classify_script(script)
+        if kind is None:
+            continue
+        text = script.string
+        if kind == 'json':
+            if len(text) > MAX_STATE_LENGTH:
+                continue
+            try:
+                data = json.loads(text)
+            except ValueError:
+                continue
+            yield from address_values(data)
+            continue
+
+        if len(text) <= MAX_STATE_LENGTH:
+            state = parse_state(text)
+            if state is not None:
+                yield from address_values(state)
+                continue
+        if len(text) > MAX_SCRIPT_LENGTH:
+            continue
+        signals = SCRIPT_SIGNALS.matches(text)
+        if 'address' in signals and 'tracker' not in signals:
+            scannable.append(text)
+
+    scanned = 0
+    for text in scannable:
+        scanned += len(text)
+        if scanned > MAX_SCANNED_LENGTH:
+            break
+        for pattern in SCRIPT_ADDRESS_PATTERNS:
+            yield from pattern.findall(text, budget)
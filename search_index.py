@@ -0,0 +1,135 @@
+import json
+import math
+import os
+import re
+import shutil
+import time
+
+import gazetteer
+
+DEFAULT_INDEX_DIR = 'public/data/search'
+INDEX_VERSION = 1
+# Records per chunk file and target postings keys per shard file
+RECORDS_PER_CHUNK = 200
+KEYS_PER_SHARD = 500
+
+HANGUL_RUN_PATTERN = re.compile(r'[가-힣]+')
+LATIN_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+MIN_PREFIX_LENGTH = 2
+# Record fields copied into the chunk files the site renders from
+RECORD_FIELDS = ['name', 'phone', 'address', 'services', 'description', 'url']
+
+
+def shard_for(key, shard_count):
+    """Shard number of a postings key; lib/clinicSearch.js must compute the same"""
+    value = 0
+    for char in key:
+        value = (value * 31 + ord(char)) % 4294967296
+    return value % shard_count
+
+
+def name_terms(name):
+    """Search terms for a clinic name
+
+    Hangul runs become bigrams (single syllables stay whole) so any part of
+    a Korean name can be searched; Latin words index every prefix from
+    MIN_PREFIX_LENGTH up for type-ahead.
+    """
+    terms = set()
+    name = name.lower()
+    for run in HANGUL_RUN_PATTERN.findall(name):
+        if len(run) == 1:
+            terms.add(run)
+        terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    for word in LATIN_WORD_PATTERN.findall(name):
+        if len(word) < MIN_PREFIX_LENGTH:
+            terms.add(word)
+        terms.update(word[:length] for length in range(MIN_PREFIX_LENGTH, len(word) + 1))
+    return terms
+
+
+def district_of(address):
+    """'서울 강남구'-style district from an address, '' if none is recognized"""
+    for start, end, place in gazetteer.find_places(address or ''):
+        if place.level == 'sigungu':
+            return f'{place.sido} {place.name}'
+    return ''
+
+
+def build_index(records):
+    """Postings, facet counts and compact records for a list of clinic dicts"""
+    postings = {}
+    facets = {'service': {}, 'gu': {}}
+    compact = []
+
+    for record_id, record in enumerate(records):
+        entry = {field: record.get(field) or ('' if field != 'services' else []) for field in RECORD_FIELDS}
+        entry['id'] = record_id
+        entry['gu'] = district_of(record.get('address'))
+        compact.append(entry)
+
+        keys = {f't:{term}' for term in name_terms(entry['name'])}
+        # Menu-scraped services can carry layout whitespace
+        entry['services'] = list(dict.fromkeys(' '.join(service.split()) for service in entry['services']))
+        for service in entry['services']:
+            keys.add(f'service:{service}')
+            facets['service'][service] = facets['service'].get(service, 0) + 1
+        if entry['gu']:
+            keys.add(f'gu:{entry["gu"]}')
+            facets['gu'][entry['gu']] = facets['gu'].get(entry['gu'], 0) + 1
+        for key in keys:
+            postings.setdefault(key, []).append(record_id)
+
+    # Most common first, which is the order the filter UI shows them in
+    facets = {
+        facet: dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+        for facet, counts in facets.items()
+    }
+    return postings, facets, compact
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as jsonfile:
+        json.dump(data, jsonfile, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_index(records, output_dir=DEFAULT_INDEX_DIR):
+    """Write the sharded index the site loads piecewise
+
+    output_dir/manifest.json   counts, shard/chunk layout
+    output_dir/facets.json     service and district counts
+    output_dir/shards/N.json   postings: key -> sorted record ids
+    output_dir/records/N.json  compact records, RECORDS_PER_CHUNK per file
+    """
+    postings, facets, compact = build_index(records)
+    shard_count = max(1, math.ceil(len(postings) / KEYS_PER_SHARD))
+
+    # Rebuild from scratch so a smaller dataset leaves no stale shards behind
+    for subdirectory in ('shards', 'records'):
+        shutil.rmtree(os.path.join(output_dir, subdirectory), ignore_errors=True)
+        os.makedirs(os.path.join(output_dir, subdirectory))
+
+    shards = [{} for _ in range(shard_count)]
+    for key in sorted(postings):
+        shards[shard_for(key, shard_count)][key] = postings[key]
+    for number, shard in enumerate(shards):
+        write_json(os.path.join(output_dir, 'shards', f'{number}.json'), shard)
+
+    chunk_count = math.ceil(len(compact) / RECORDS_PER_CHUNK)
+    for number in range(chunk_count):
+        chunk = compact[number * RECORDS_PER_CHUNK:(number + 1) * RECORDS_PER_CHUNK]
+        write_json(os.path.join(output_dir, 'records', f'{number}.json'), chunk)
+
+    write_json(os.path.join(output_dir, 'facets.json'), facets)
+    # The manifest goes last: a reader never sees it point at missing files
+    write_json(os.path.join(output_dir, 'manifest.json'), {
+        'version': INDEX_VERSION,
+        'built_at': int(time.time()),
+        'record_count': len(compact),
+        'records_per_chunk': RECORDS_PER_CHUNK,
+        'chunk_count': chunk_count,
+        'shard_count': shard_count,
+        'min_prefix_length': MIN_PREFIX_LENGTH,
+    })
+    print(f"Indexed {len(compact)} clinics: {len(postings)} keys in {shard_count} shards, "
+          f"{chunk_count} record chunks in {output_dir}")
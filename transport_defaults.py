@@ -0,0 +1,11 @@
+# Transport defaults - every request is bounded by these. Kept free of
+# third-party imports so the CLI can show them without loading requests.
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 20
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# Minimum seconds between requests to one host; concurrency across hosts is adaptive
+DEFAULT_HOST_DELAY = 1.0
+# Per-page download cap
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024